@@ -107,7 +107,9 @@ Tip: to add of silence (1.4 seconds) into your text just use "###" or "[pause]".
         '--temperature', '--length_penalty', '--num_beams', '--repetition_penalty', 
         '--top_k', '--top_p', '--speed', '--enable_text_splitting',
         '--text_temp', '--waveform_temp',
-        '--output_dir', '--version', '--workflow', '--help'
+        '--output_dir', '--version', '--workflow', '--help',
+        '--torch_compile', '--bf16_autocast',
+        '--supertonic_total_step', '--supertonic_speed', '--supertonic_quant'
     ]
     tts_engine_list_keys = [k for k in TTS_ENGINES.keys()]
     tts_engine_list_values = [k for k in TTS_ENGINES.values()]
@@ -157,11 +159,17 @@ Tip: to add of silence (1.4 seconds) into your text just use "###" or "[pause]".
     Default to config.json model.""")
     headless_optional_group.add_argument(options[23], type=float, default=default_engine_settings[TTS_ENGINES['BARK']]['waveform_temp'], help=f"""(bark only, optional) Waveform Temperature for the model.
     Default to config.json model.""")
+    headless_optional_group.add_argument('--torch_compile', action='store_true', help=f"""(vits only, optional) Compile the VITS inference with torch.compile. 
+    The first sentence takes much longer, only worth it for whole books.""")
+    headless_optional_group.add_argument('--bf16_autocast', action='store_true', help=f"""(vits only, optional) Run the VITS inference under bf16 autocast. 
+    Only used on CUDA GPUs supporting bf16.""")
     # Supertonic parameters
     headless_optional_group.add_argument('--supertonic_total_step', type=int, default=default_engine_settings[TTS_ENGINES['SUPERTONIC']]['total_step'], help=f"""(supertonic only, optional) Total denoising steps for Supertonic.
     Default to config.json model. Higher values may improve quality but increase computation time.""")
     headless_optional_group.add_argument('--supertonic_speed', type=float, default=default_engine_settings[TTS_ENGINES['SUPERTONIC']]['speed'], help=f"""(supertonic only, optional) Speech speed factor for Supertonic.
     Default to config.json model. Values > 1.0 make speech faster, < 1.0 make it slower.""")
+    headless_optional_group.add_argument('--supertonic_quant', type=str, default=default_engine_settings[TTS_ENGINES['SUPERTONIC']]['quant'], choices=['int8', 'fp16'], help=f"""(supertonic only, optional) Run the vector estimator quantized, created once next to the model on first use.
+    Default is full precision. Falls back to full precision if the quantized model cannot be created.""")
     headless_optional_group.add_argument(options[24], type=str, help=f'''(Optional) Path to the output directory. Default is set in ./lib/conf.py''')
     headless_optional_group.add_argument(options[25], action='version', version=f'ebook2audiobook version {prog_version}', help='''Show the version of the script and exit''')
     headless_optional_group.add_argument(options[26], action='store_true', help=argparse.SUPPRESS)
@@ -37,7 +37,7 @@ def detect_gender(voice_path:str)->str|None:
         print(error)
         return None
 
-def trim_audio(audio_data: Union[list[float], Tensor], samplerate: int, silence_threshold: float = 0.003, buffer_sec: float = 0.005) -> Tensor:
+def trim_audio(audio_data: Union[list[float], Tensor], samplerate: int, silence_threshold: float = 0.003, buffer_sec: float = 0.005, keep_device: bool = False) -> Tensor:
     # Ensure audio_data is a PyTorch tensor
     if isinstance(audio_data, list):
         audio_data = torch.tensor(audio_data, dtype=torch.float32)
@@ -46,15 +46,17 @@ def trim_audio(audio_data: Union[list[float], Tensor], samplerate: int, silence_
             error = "audio_data must be a 1D tensor (mono audio)."
             raise ValueError(error)
             return torch.tensor([], dtype=torch.float32)  # just for static analyzers
-        if audio_data.is_cuda:
+        # keep_device trims where the audio is, so only the kept samples get copied off the GPU afterwards
+        if audio_data.is_cuda and not keep_device:
             audio_data = audio_data.cpu()
         # Detect non-silent indices
         non_silent_indices = torch.where(audio_data.abs() > silence_threshold)[0]
         if len(non_silent_indices) == 0:
-            return torch.tensor([], dtype=audio_data.dtype)  # Preserves dtype
-        # Calculate start and end trimming indices with buffer
-        start_index = max(non_silent_indices[0].item() - int(buffer_sec * samplerate), 0)
-        end_index = min(non_silent_indices[-1].item() + int(buffer_sec * samplerate), audio_data.size(0))
+            return torch.tensor([], dtype=audio_data.dtype, device=audio_data.device)  # Preserves dtype
+        # Calculate start and end trimming indices with buffer (one host read for both bounds)
+        first_index, last_index = non_silent_indices[[0, -1]].tolist()
+        start_index = max(first_index - int(buffer_sec * samplerate), 0)
+        end_index = min(last_index + int(buffer_sec * samplerate), audio_data.size(0))
         return audio_data[start_index:end_index]
     error = "audio_data must be a PyTorch tensor or a list of numerical values."
     raise TypeError(error)
@@ -38,6 +38,8 @@ class FairseqTTS:
             self.vtt_path = os.path.join(self.session['process_dir'], Path(self.session['final_name']).stem + '.vtt')
             self.resampler_cache = {}
             self.audio_segments = []
+            self._silence_buf = torch.zeros(1, int(self.params['samplerate'] * 2.0))
+            self._vram_detector = VRAMDetector()
             self._load_engine()
             self._load_engine_zs()
         except Exception as e:
@@ -50,15 +52,18 @@ class FairseqTTS:
             with lock:
                 from TTS.api import TTS as TTSEngine
                 engine = loaded_tts.get(key, False)
-                if not engine:
-                    engine = TTSEngine(model_path)
                 if engine:
-                    vram_dict = VRAMDetector().detect_vram(self.session['device'])
-                    self.session['free_vram_gb'] = vram_dict.get('free_vram_gb', 0)
+                    return engine
+                engine = TTSEngine(model_path)
+            if engine:
+                # VRAM polling goes through the driver, keep it out of the lock
+                vram_dict = self._vram_detector.detect_vram(self.session['device'])
+                self.session['free_vram_gb'] = vram_dict.get('free_vram_gb', 0)
+                with lock:
                     models_loaded_size_gb = loaded_tts_size_gb(loaded_tts)
                     if self.session['free_vram_gb'] > models_loaded_size_gb:
                         loaded_tts[key] = engine
-                return engine
+            return engine
         except Exception as e:
             error = f"_load_api() error: {e}"
             print(error)
@@ -183,7 +188,7 @@ class FairseqTTS:
             )
         return self.resampler_cache[key]
 
-    def _resample_wav(self, wav_path: str, expected_sr: int) -> str:
+    def _resample_wav(self, wav_path: str, expected_sr: int, out_dir: str = tmp_dir) -> str:
         waveform, orig_sr = torchaudio.load(wav_path)
         if orig_sr == expected_sr and waveform.size(0) == 1:
             return wav_path
@@ -192,16 +197,20 @@ class FairseqTTS:
         if orig_sr != expected_sr:
             resampler = self._get_resampler(orig_sr, expected_sr)
             waveform = resampler(waveform)
-        wav_tensor = waveform.squeeze(0)
-        wav_numpy = wav_tensor.cpu().numpy()
-        os.makedirs(tmp_dir, exist_ok=True)
-        import soundfile as sf
-        tmp_fh = tempfile.NamedTemporaryFile(dir=tmp_dir, suffix=".wav", delete=False)
+        os.makedirs(out_dir, exist_ok=True)
+        tmp_fh = tempfile.NamedTemporaryFile(dir=out_dir, suffix=".wav", delete=False)
         tmp_path = tmp_fh.name
         tmp_fh.close()
-        sf.write(tmp_path, wav_numpy, expected_sr, subtype="PCM_16")
+        torchaudio.save(tmp_path, waveform.cpu(), expected_sr, encoding="PCM_S", bits_per_sample=16)
         return tmp_path
 
+    def _silence(self, silence_time: float) -> torch.Tensor:
+        # Read-only view on a shared zero buffer, torch.cat() copies it anyway
+        samples = int(self.params['samplerate'] * silence_time)
+        if samples > self._silence_buf.shape[-1]:
+            self._silence_buf = torch.zeros(1, samples)
+        return self._silence_buf[:, :samples]
+
     def convert(self, sentence_index: int, sentence: str) -> bool:
         try:
             speaker = None
@@ -218,20 +227,20 @@ class FairseqTTS:
 
                 if sentence == TTS_SML['break']:
                     silence_time = int(np.random.uniform(0.3, 0.6) * 100) / 100
-                    break_tensor = torch.zeros(1, int(settings['samplerate'] * silence_time))
-                    self.audio_segments.append(break_tensor.clone())
+                    self.audio_segments.append(self._silence(silence_time))
                     return True
                 elif not sentence.replace('—', '').strip() or sentence == TTS_SML['pause']:
                     silence_time = int(np.random.uniform(1.0, 1.8) * 100) / 100
-                    pause_tensor = torch.zeros(1, int(settings['samplerate'] * silence_time))
-                    self.audio_segments.append(pause_tensor.clone())
+                    self.audio_segments.append(self._silence(silence_time))
                     return True
                 else:
                     if sentence.endswith("'"):
                         sentence = sentence[:-1]
 
                     trim_audio_buffer = 0.004
-                    sentence += '—' if sentence[-1].isalnum() else ''
+                    # A trailing '—' would only be mapped back to a space below, keep the intent as a flag
+                    needs_trailing_dash = sentence[-1].isalnum()
+                    ends_with_dash = needs_trailing_dash or sentence[-1] == '—'
 
                     speaker_argument = {}
                     not_supported_punc_pattern = re.compile(r"[.:—]")
@@ -239,67 +248,62 @@ class FairseqTTS:
                     if settings['voice_path'] is not None:
                         proc_dir = os.path.join(self.session['voice_dir'], 'proc')
                         os.makedirs(proc_dir, exist_ok=True)
-                        tmp_in_wav = os.path.join(proc_dir, f"{uuid.uuid4()}.wav")
-                        tmp_out_wav = os.path.join(proc_dir, f"{uuid.uuid4()}.wav")
-
-                        with torch.no_grad():
-                            self.engine.tts_to_file(
-                                text=re.sub(not_supported_punc_pattern, ' ', sentence),
-                                file_path=tmp_in_wav,
-                                **speaker_argument
-                            )
-
-                        if settings['voice_path'] in settings['semitones'].keys():
-                            semitones = settings['semitones'][settings['voice_path']]
-                        elif os.path.exists(settings['voice_path']):
-                            voice_path_gender = detect_gender(settings['voice_path'])
-                            voice_builtin_gender = detect_gender(tmp_in_wav)
-                            msg = f"Cloned voice seems to be {voice_path_gender}\nBuiltin voice seems to be {voice_builtin_gender}"
-                            print(msg)
-                            if voice_builtin_gender != voice_path_gender:
-                                semitones = -4 if voice_path_gender == 'male' else 4
-                                msg = f"Adapting builtin voice frequencies from the clone voice..."
+                        # Every intermediate wav of this sentence lives in td and is removed with it
+                        with tempfile.TemporaryDirectory(dir=proc_dir) as td:
+                            tmp_in_wav = os.path.join(td, f"{uuid.uuid4()}.wav")
+                            tmp_out_wav = os.path.join(td, f"{uuid.uuid4()}.wav")
+
+                            with torch.no_grad():
+                                self.engine.tts_to_file(
+                                    text=re.sub(not_supported_punc_pattern, ' ', sentence),
+                                    file_path=tmp_in_wav,
+                                    **speaker_argument
+                                )
+
+                            if settings['voice_path'] in settings['semitones'].keys():
+                                semitones = settings['semitones'][settings['voice_path']]
+                            elif os.path.exists(settings['voice_path']):
+                                voice_path_gender = detect_gender(settings['voice_path'])
+                                voice_builtin_gender = detect_gender(tmp_in_wav)
+                                msg = f"Cloned voice seems to be {voice_path_gender}\nBuiltin voice seems to be {voice_builtin_gender}"
                                 print(msg)
+                                if voice_builtin_gender != voice_path_gender:
+                                    semitones = -4 if voice_path_gender == 'male' else 4
+                                    msg = f"Adapting builtin voice frequencies from the clone voice..."
+                                    print(msg)
+                                else:
+                                    semitones = 0
+                                settings['semitones'][settings['voice_path']] = semitones
                             else:
                                 semitones = 0
-                            settings['semitones'][settings['voice_path']] = semitones
-                        else:
-                            semitones = 0
-
-                        if semitones > 0:
-                            try:
-                                cmd = [
-                                    shutil.which('sox'), tmp_in_wav,
-                                    "-r", str(settings['samplerate']), tmp_out_wav,
-                                    "pitch", str(semitones * 100)
-                                ]
-                                subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                            except (subprocess.CalledProcessError, FileNotFoundError) as e:
-                                error = f"Subprocess error: {e}"
+
+                            if semitones > 0:
+                                try:
+                                    cmd = [
+                                        shutil.which('sox'), tmp_in_wav,
+                                        "-r", str(settings['samplerate']), tmp_out_wav,
+                                        "pitch", str(semitones * 100)
+                                    ]
+                                    subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                                except (subprocess.CalledProcessError, FileNotFoundError) as e:
+                                    error = f"Subprocess error: {e}"
+                                    print(error)
+                                    return False
+                            else:
+                                tmp_out_wav = tmp_in_wav
+
+                            if self.engine_zs:
+                                settings['samplerate'] = TTS_VOICE_CONVERSION[self.tts_zs_key]['samplerate']
+                                source_wav = self._resample_wav(tmp_out_wav, settings['samplerate'], td)
+                                target_wav = self._resample_wav(settings['voice_path'], settings['samplerate'], td)
+                                audio_sentence = self.engine_zs.voice_conversion(
+                                    source_wav=source_wav,
+                                    target_wav=target_wav
+                                )
+                            else:
+                                error = f'Engine {self.tts_zs_key} is None'
                                 print(error)
                                 return False
-                        else:
-                            tmp_out_wav = tmp_in_wav
-
-                        if self.engine_zs:
-                            settings['samplerate'] = TTS_VOICE_CONVERSION[self.tts_zs_key]['samplerate']
-                            source_wav = self._resample_wav(tmp_out_wav, settings['samplerate'])
-                            target_wav = self._resample_wav(settings['voice_path'], settings['samplerate'])
-                            audio_sentence = self.engine_zs.voice_conversion(
-                                source_wav=source_wav,
-                                target_wav=target_wav
-                            )
-                        else:
-                            error = f'Engine {self.tts_zs_key} is None'
-                            print(error)
-                            return False
-
-                        if os.path.exists(tmp_in_wav):
-                            os.remove(tmp_in_wav)
-                        if os.path.exists(tmp_out_wav):
-                            os.remove(tmp_out_wav)
-                        if 'source_wav' in locals() and os.path.exists(source_wav):
-                            os.remove(source_wav)
                     else:
                         with torch.no_grad():
                             audio_sentence = self.engine.tts(
@@ -311,15 +315,14 @@ class FairseqTTS:
                         sourceTensor = self._tensor_type(audio_sentence)
                         audio_tensor = sourceTensor.clone().detach().unsqueeze(0).cpu()
 
-                        if sentence[-1].isalnum() or sentence[-1] == '—':
+                        if ends_with_dash:
                             audio_tensor = trim_audio(audio_tensor.squeeze(), settings['samplerate'], 0.001, trim_audio_buffer).unsqueeze(0)
 
                         if audio_tensor is not None and audio_tensor.numel() > 0:
                             self.audio_segments.append(audio_tensor)
-                            if not re.search(r'\w$', sentence, flags=re.UNICODE) and sentence[-1] != '—':
+                            if not ends_with_dash and not re.search(r'\w$', sentence, flags=re.UNICODE):
                                 silence_time = int(np.random.uniform(0.3, 0.6) * 100) / 100
-                                break_tensor = torch.zeros(1, int(settings['samplerate'] * silence_time))
-                                self.audio_segments.append(break_tensor.clone())
+                                self.audio_segments.append(self._silence(silence_time))
 
                             if self.audio_segments:
                                 audio_tensor = torch.cat(self.audio_segments, dim=-1)
@@ -360,5 +363,5 @@ class FairseqTTS:
                 return False
         except Exception as e:
             error = f'FairseqTTS.convert(): {e}'
-            raise ValueError(e)
-            return False
\ No newline at end of file
+            print(error)
+            raise
\ No newline at end of file
@@ -1,10 +1,11 @@
 import os
 import json
+import logging
+import weakref
 import numpy as np
-import soundfile as sf
-import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Tuple
-from huggingface_hub import hf_hub_download
+
 from lib.models import TTS_ENGINES, default_engine_settings, models
 from lib.conf import tts_dir, default_audio_proc_format
 from lib.classes.tts_engines.common.utils import cleanup_memory
@@ -12,11 +13,41 @@ from lib import loaded_tts
 
 # Import Supertonic components from local helper (renamed to utils to bypass cache)
 from lib.classes.tts_engines.supertonic_utils import (
-    load_text_to_speech, load_voice_style
+    load_text_to_speech, load_voice_style, quantize_vector_estimator
 )
 
+log = logging.getLogger(__name__)
+
+# Loaded TextToSpeech engines keyed by (model_dir, quant), shared across instances and tts_keys.
+# Weak values: loaded_tts owns the engines, once cleanup_models_cache() prunes them they are released
+_ENGINE_CACHE: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
 
 class SupertonicTTS:
+    # Parsed voice styles shared by all instances, keyed by (path, mtime)
+    _STYLE_CACHE: dict[tuple[str, float], Any] = {}
+    _STYLE_CACHE_SIZE = 16
+
+    # Voice characteristics mapping with seed offsets and base patterns
+    # Each voice type has different pitch, tone, and style characteristics
+    _VOICE_CONFIGS = {
+        # Male voices - lower pitch, deeper resonance
+        'M1': {'seed': 101, 'pitch_offset': -0.3, 'resonance': 0.2, 'brightness': -0.1},
+        'M2': {'seed': 102, 'pitch_offset': -0.5, 'resonance': 0.4, 'brightness': -0.2},  # Deeper
+        'M3': {'seed': 103, 'pitch_offset': -0.1, 'resonance': 0.1, 'brightness': 0.1},   # Younger
+        # Female voices - higher pitch, brighter tone
+        'F1': {'seed': 201, 'pitch_offset': 0.3, 'resonance': -0.1, 'brightness': 0.2},
+        'F2': {'seed': 202, 'pitch_offset': 0.2, 'resonance': -0.2, 'brightness': 0.1},   # Softer
+        'F3': {'seed': 203, 'pitch_offset': 0.4, 'resonance': -0.1, 'brightness': 0.4},   # Brighter
+        # Child voices - much higher pitch, very light resonance for young sound
+        'C1': {'seed': 301, 'pitch_offset': 1.5, 'resonance': -0.5, 'brightness': 0.8},   # Young boy
+        'C2': {'seed': 302, 'pitch_offset': 1.8, 'resonance': -0.5, 'brightness': 1.0},   # Young girl
+        # Elder voices - slightly lower pitch, warm tone
+        'E1': {'seed': 401, 'pitch_offset': -0.2, 'resonance': 0.3, 'brightness': -0.1},  # Wise male
+        'E2': {'seed': 402, 'pitch_offset': 0.1, 'resonance': 0.1, 'brightness': 0.0},    # Gentle female
+    }
+    _DEFAULT_VOICE_CONFIG = {'seed': 500, 'pitch_offset': 0.0, 'resonance': 0.0, 'brightness': 0.0}
+
     def __init__(self, session: dict) -> None:
         """Initialize Supertonic TTS engine"""
         self.session = session
@@ -30,6 +61,9 @@ class SupertonicTTS:
                                           default_engine_settings[TTS_ENGINES['SUPERTONIC']]['total_step'])
         self.speed = self.session.get('supertonic_speed',
                                      default_engine_settings[TTS_ENGINES['SUPERTONIC']]['speed'])
+        # Optional vector_estimator quantization: 'int8', 'fp16' or None
+        self.quant = self.session.get('supertonic_quant',
+                                     default_engine_settings[TTS_ENGINES['SUPERTONIC']].get('quant'))
         
         # Get model config
         fine_tuned = self.session.get('fine_tuned', 'internal')
@@ -46,74 +80,87 @@ class SupertonicTTS:
         # Define the local model directory
         # Use fine_tuned name to separate model files (e.g. supertonic/dutch, supertonic/internal)
         self.model_dir = os.path.join(self.cache_dir, 'supertonic', fine_tuned)
+        # Model files keep the HF repo onnx/ layout (older installs have them in model_dir itself)
+        self.model_dir_onnx = os.path.join(self.model_dir, 'onnx')
+        
+        # Style of the voice used by the previous sentence
+        self._current_style = None
+        self._current_voice_path = None
+        # float32 output buffer reused across sentences, allocated on first use
+        self._audio_buf = None
+        # Set once voice_styles/ is known to exist
+        self._voice_dir_ready = False
+        # session['voice'] value -> resolved voice style path
+        self._voice_path_cache: dict[Any, str] = {}
         
         # Initialize Supertonic engine
         self._initialize_engine()
 
     def _check_models_exist(self) -> bool:
         """Check if all required model files exist locally"""
-        required_files = ['tts.json', 'unicode_indexer.json', 'duration_predictor.onnx', 
-                          'text_encoder.onnx', 'vector_estimator.onnx', 'vocoder.onnx']
+        required_files = {'tts.json', 'unicode_indexer.json', 'duration_predictor.onnx',
+                          'text_encoder.onnx', 'vector_estimator.onnx', 'vocoder.onnx'}
         
-        for file in required_files:
-            file_path = os.path.join(self.model_dir, file)
-            if not os.path.exists(file_path):
-                return False
-        return True
+        # One directory read instead of a stat per file
+        for onnx_dir in (self.model_dir_onnx, self.model_dir):
+            try:
+                with os.scandir(onnx_dir) as entries:
+                    names = {entry.name for entry in entries if entry.is_file()}
+            except FileNotFoundError:
+                continue
+            if required_files.issubset(names):
+                self.model_dir_onnx = onnx_dir
+                return True
+        return False
 
     def _download_models(self) -> bool:
         """Download Supertonic models from Hugging Face"""
         try:
+            from huggingface_hub import hf_hub_download
+            
             print(f"Downloading Supertonic models from {self.repo_id}...")
             print(f"This may take a while on first run. Please be patient...")
             
             # Create model directory
-            os.makedirs(self.model_dir, exist_ok=True)
+            os.makedirs(self.model_dir_onnx, exist_ok=True)
             
-            # Map of local files to HF repo paths
-            # HF repo has files in onnx/ folder (always)
+            # HF repo has files in onnx/ folder (always), downloaded as is into model_dir/onnx
             # All models use the same onnx/ folder - the only model available
+            repo_files = ['tts.json', 'unicode_indexer.json', 'duration_predictor.onnx',
+                          'text_encoder.onnx', 'vector_estimator.onnx', 'vocoder.onnx']
             
-            file_mapping = {
-                'tts.json': 'onnx/tts.json',
-                'unicode_indexer.json': 'onnx/unicode_indexer.json',
-                'duration_predictor.onnx': 'onnx/duration_predictor.onnx',
-                'text_encoder.onnx': 'onnx/text_encoder.onnx',
-                'vector_estimator.onnx': 'onnx/vector_estimator.onnx',
-                'vocoder.onnx': 'onnx/vocoder.onnx'
-            }
-            
-            for local_name, repo_path in file_mapping.items():
-                local_file_path = os.path.join(self.model_dir, local_name)
-                
-                if not os.path.exists(local_file_path):
-                    print(f"Downloading {local_name}...")
-                    try:
-                        hf_hub_download(
+            missing = [
+                file for file in repo_files
+                if not os.path.exists(os.path.join(self.model_dir_onnx, file))
+            ]
+            if missing:
+                # Files are independent, fetch them concurrently
+                with ThreadPoolExecutor(max_workers=min(6, len(missing))) as executor:
+                    futures = {}
+                    for file in missing:
+                        print(f"Downloading {file}...")
+                        future = executor.submit(
+                            hf_hub_download,
                             repo_id=self.repo_id,
-                            filename=repo_path,
+                            filename=file,
+                            subfolder='onnx',
                             cache_dir=self.cache_dir,
                             local_dir=self.model_dir,
                             local_dir_use_symlinks=False
                         )
-                        # Move file from onnx/ subdirectory to model_dir root
-                        downloaded_file = os.path.join(self.model_dir, repo_path)
-                        if os.path.exists(downloaded_file) and not os.path.exists(local_file_path):
-                            shutil.move(downloaded_file, local_file_path)
-                        print(f"  Downloaded: {local_name}")
-                    except Exception as e:
-                        print(f"  Failed to download {local_name}: {e}")
+                        futures[future] = file
+                    failed = False
+                    for future in as_completed(futures):
+                        file = futures[future]
+                        try:
+                            future.result()
+                            print(f"  Downloaded: {file}")
+                        except Exception as e:
+                            print(f"  Failed to download {file}: {e}")
+                            failed = True
+                    if failed:
                         return False
             
-            # Clean up onnx directory if empty
-            onnx_dir = os.path.join(self.model_dir, 'onnx')
-            if os.path.exists(onnx_dir):
-                try:
-                    if not os.listdir(onnx_dir):
-                        os.rmdir(onnx_dir)
-                except:
-                    pass
-            
             # Download voice styles
             self._download_voice_styles()
             
@@ -131,103 +178,122 @@ class SupertonicTTS:
         (style_ttl [1,8,256] vs model expects [1,50,256]), so we create defaults instead.
         """
         try:
-            # Create voice_styles directory
             voice_styles_dir = os.path.join(self.model_dir, "voice_styles")
-            os.makedirs(voice_styles_dir, exist_ok=True)
             
             # Create all voice styles with correct dimensions matching tts.json
             # The ONNX model expects style_ttl [1, 50, 256] and style_dp [1, 8, 16]
-            all_voices = ['M1', 'M2', 'M3', 'F1', 'F2', 'F3', 'C1', 'C2', 'E1', 'E2']
+            all_voices = frozenset(['M1', 'M2', 'M3', 'F1', 'F2', 'F3', 'C1', 'C2', 'E1', 'E2'])
+            
+            # One directory read tells which voices already exist
+            try:
+                with os.scandir(voice_styles_dir) as entries:
+                    names = [os.path.splitext(entry.name) for entry in entries]
+                existing = {voice_id for voice_id, ext in names if ext == '.npz'}
+                legacy = {voice_id for voice_id, ext in names if ext == '.json'}
+            except FileNotFoundError:
+                # Create voice_styles directory
+                os.makedirs(voice_styles_dir)
+                existing = set()
+                legacy = set()
+            self._voice_dir_ready = True
             
-            for voice_id in all_voices:
-                local_voice_path = os.path.join(voice_styles_dir, f"{voice_id}.json")
-                if not os.path.exists(local_voice_path):
-                    self._create_default_voice_style(local_voice_path)
-                    print(f"  Created voice style: {voice_id}")
+            # Styles from older installs are converted as-is, regenerating them would change the voice
+            for voice_id in sorted((all_voices - existing) & legacy):
+                if self._migrate_json_voice_style(os.path.join(voice_styles_dir, f"{voice_id}.npz")):
+                    existing.add(voice_id)
+            missing = all_voices - existing
+            if missing:
+                self._create_all_default_voice_styles(sorted(missing))
                         
         except Exception as e:
             print(f"Warning: Could not create voice styles: {e}")
 
-    def _create_default_voice_style(self, voice_style_path: str) -> None:
-        """Create a voice style file with distinctive embeddings for each voice type.
+    def _generate_voice_styles(self, voice_ids: list[str]) -> Tuple[np.ndarray, np.ndarray, list[dict]]:
+        """Generate style_ttl [N, 50, 256] and style_dp [N, 8, 16] for all voice_ids at once.
         
         Uses seeded random values to create reproducible but distinctive voice characteristics
         for each voice type (Male, Female, Child, Elder with variations).
         """
-        import numpy as np
+        configs = [self._VOICE_CONFIGS.get(voice_id, self._DEFAULT_VOICE_CONFIG) for voice_id in voice_ids]
+        style_ttl = np.empty((len(voice_ids), 50, 256), dtype=np.float32)
+        style_dp = np.empty((len(voice_ids), 8, 16), dtype=np.float32)
+        for i, config in enumerate(configs):
+            # One seeded generator per voice keeps each style reproducible on its own
+            rng = np.random.default_rng(config['seed'])
+            rng.standard_normal(dtype=np.float32, out=style_ttl[i])
+            rng.standard_normal(dtype=np.float32, out=style_dp[i])
+        
+        # style_ttl controls text-to-latent style: small random values with voice-specific offsets
+        # style_dp controls duration prediction
+        style_ttl *= 0.1
+        style_dp *= 0.05
         
+        # Apply voice characteristics to specific dimensions
+        # First dimensions often control pitch/tone characteristics
+        offsets = np.array(
+            [[c['pitch_offset'], c['resonance'], c['brightness']] for c in configs], dtype=np.float32
+        )
+        style_ttl[:, :10, :] += offsets[:, 0, None, None] * 0.2
+        style_ttl[:, 10:20, :] += offsets[:, 1, None, None] * 0.15
+        style_ttl[:, 20:30, :] += offsets[:, 2, None, None] * 0.15
+        return style_ttl, style_dp, configs
+
+    def _write_voice_style(self, voice_style_path: str, voice_id: str, style_ttl: np.ndarray, style_dp: np.ndarray, config: dict) -> None:
+        """Write one voice style ([1, 50, 256] and [1, 8, 16] arrays) to an .npz file"""
+        metadata = {
+            "voice_id": voice_id,
+            "source_file": f"{voice_id}_synthetic",
+            "source_sample_rate": 44100,
+            "target_sample_rate": 44100,
+            "pitch_offset": config['pitch_offset'],
+            "resonance": config['resonance'],
+            "brightness": config['brightness']
+        }
+        
+        # Raw float32 arrays, loaded back without any parsing
+        with open(voice_style_path, 'wb') as f:
+            np.savez(f, style_ttl=style_ttl, style_dp=style_dp, meta=np.array(json.dumps(metadata)))
+
+    def _migrate_json_voice_style(self, voice_style_path: str) -> bool:
+        """Convert the legacy JSON style next to voice_style_path to .npz, False if there is none"""
+        json_path = f"{os.path.splitext(voice_style_path)[0]}.json"
+        if not os.path.isfile(json_path):
+            return False
         try:
-            os.makedirs(os.path.dirname(voice_style_path), exist_ok=True)
-            
-            # Extract voice ID from path (e.g., "M1" from "/path/to/M1.json")
-            voice_id = os.path.splitext(os.path.basename(voice_style_path))[0]
-            
-            # Voice characteristics mapping with seed offsets and base patterns
-            # Each voice type has different pitch, tone, and style characteristics
-            voice_configs = {
-                # Male voices - lower pitch, deeper resonance
-                'M1': {'seed': 101, 'pitch_offset': -0.3, 'resonance': 0.2, 'brightness': -0.1},
-                'M2': {'seed': 102, 'pitch_offset': -0.5, 'resonance': 0.4, 'brightness': -0.2},  # Deeper
-                'M3': {'seed': 103, 'pitch_offset': -0.1, 'resonance': 0.1, 'brightness': 0.1},   # Younger
-                # Female voices - higher pitch, brighter tone
-                'F1': {'seed': 201, 'pitch_offset': 0.3, 'resonance': -0.1, 'brightness': 0.2},
-                'F2': {'seed': 202, 'pitch_offset': 0.2, 'resonance': -0.2, 'brightness': 0.1},   # Softer
-                'F3': {'seed': 203, 'pitch_offset': 0.4, 'resonance': -0.1, 'brightness': 0.4},   # Brighter
-                # Child voices - much higher pitch, very light resonance for young sound
-                'C1': {'seed': 301, 'pitch_offset': 1.5, 'resonance': -0.5, 'brightness': 0.8},   # Young boy
-                'C2': {'seed': 302, 'pitch_offset': 1.8, 'resonance': -0.5, 'brightness': 1.0},   # Young girl
-                # Elder voices - slightly lower pitch, warm tone
-                'E1': {'seed': 401, 'pitch_offset': -0.2, 'resonance': 0.3, 'brightness': -0.1},  # Wise male
-                'E2': {'seed': 402, 'pitch_offset': 0.1, 'resonance': 0.1, 'brightness': 0.0},    # Gentle female
+            style = load_voice_style([json_path])
+            metadata = {
+                "voice_id": os.path.splitext(os.path.basename(voice_style_path))[0],
+                "source_file": os.path.basename(json_path)
             }
+            with open(voice_style_path, 'wb') as f:
+                np.savez(f, style_ttl=style.ttl, style_dp=style.dp, meta=np.array(json.dumps(metadata)))
+            print(f"  Converted voice style: {os.path.basename(json_path)}")
+            return True
+        except Exception as e:
+            print(f"Could not convert voice style {json_path}: {e}")
+            return False
+
+    def _create_all_default_voice_styles(self, voice_ids: list[str]) -> None:
+        """Create the default voice style files of voice_ids in a single vectorized pass"""
+        voice_styles_dir = os.path.join(self.model_dir, "voice_styles")
+        style_ttl, style_dp, configs = self._generate_voice_styles(voice_ids)
+        for i, voice_id in enumerate(voice_ids):
+            voice_style_path = os.path.join(voice_styles_dir, f"{voice_id}.npz")
+            self._write_voice_style(voice_style_path, voice_id, style_ttl[i:i + 1], style_dp[i:i + 1], configs[i])
+            print(f"  Created voice style: {voice_id}")
+
+    def _create_default_voice_style(self, voice_style_path: str) -> None:
+        """Create a voice style file with distinctive embeddings for its voice type."""
+        try:
+            if not self._voice_dir_ready:
+                os.makedirs(os.path.dirname(voice_style_path), exist_ok=True)
+                self._voice_dir_ready = True
             
-            # Get config for this voice or use default
-            config = voice_configs.get(voice_id, {'seed': 500, 'pitch_offset': 0.0, 'resonance': 0.0, 'brightness': 0.0})
-            
-            # Set seed for reproducibility
-            np.random.seed(config['seed'])
-            
-            # Generate style_ttl: [1, 50, 256] - controls text-to-latent style
-            # Use small random values with voice-specific offsets for characteristic sound
-            style_ttl_base = np.random.randn(1, 50, 256).astype(np.float32) * 0.1
-            
-            # Apply voice characteristics to specific dimensions
-            # First dimensions often control pitch/tone characteristics
-            style_ttl_base[0, :10, :] += config['pitch_offset'] * 0.2
-            style_ttl_base[0, 10:20, :] += config['resonance'] * 0.15
-            style_ttl_base[0, 20:30, :] += config['brightness'] * 0.15
-            
-            # Generate style_dp: [1, 8, 16] - controls duration prediction
-            style_dp_base = np.random.randn(1, 8, 16).astype(np.float32) * 0.05
-            
-            # Convert to nested lists for JSON
-            style_ttl_data = style_ttl_base.tolist()
-            style_dp_data = style_dp_base.tolist()
-            
-            voice_style = {
-                "style_ttl": {
-                    "data": style_ttl_data,
-                    "dims": [1, 50, 256],
-                    "type": "float32"
-                },
-                "style_dp": {
-                    "data": style_dp_data,
-                    "dims": [1, 8, 16],
-                    "type": "float32"
-                },
-                "metadata": {
-                    "voice_id": voice_id,
-                    "source_file": f"{voice_id}_synthetic",
-                    "source_sample_rate": 44100,
-                    "target_sample_rate": 44100,
-                    "pitch_offset": config['pitch_offset'],
-                    "resonance": config['resonance'],
-                    "brightness": config['brightness']
-                }
-            }
+            # Extract voice ID from path (e.g., "M1" from "/path/to/M1.npz")
+            voice_id = os.path.splitext(os.path.basename(voice_style_path))[0]
             
-            with open(voice_style_path, 'w') as f:
-                json.dump(voice_style, f)
+            style_ttl, style_dp, configs = self._generate_voice_styles([voice_id])
+            self._write_voice_style(voice_style_path, voice_id, style_ttl, style_dp, configs[0])
                 
         except Exception as e:
             print(f"Could not create voice style for {voice_style_path}: {e}")
@@ -245,7 +311,20 @@ class SupertonicTTS:
                     return
 
             # Load Supertonic engine
-            self.engine = load_text_to_speech(self.model_dir, False)  # False for CPU mode
+            sess_options = {
+                'intra_op_num_threads': max(1, (os.cpu_count() or 2) // 2),
+                'enable_cpu_mem_arena': False,
+                'enable_mem_pattern': False
+            }
+            # Quantized vector_estimator is created once on first use, full precision is the fallback
+            quant = self.quant
+            if quant and quantize_vector_estimator(self.model_dir_onnx, quant) is None:
+                quant = None
+            engine = _ENGINE_CACHE.get((self.model_dir, quant))
+            if engine is None:
+                engine = load_text_to_speech(self.model_dir_onnx, False, sess_options, quant)  # False for CPU mode
+                _ENGINE_CACHE[(self.model_dir, quant)] = engine
+            self.engine = engine
 
             if self.engine:
                 print(f"Supertonic TTS engine initialized successfully!")
@@ -264,9 +343,15 @@ class SupertonicTTS:
         # Get voice from session or use default M1
         voice_id = self.session.get('voice', 'M1')
         
+        # Resolved once per session voice value
+        cached = self._voice_path_cache.get(voice_id)
+        if cached is not None:
+            return cached
+        session_voice = voice_id
+        
         # If voice is a file path, extract just the ID
         if voice_id and os.path.sep in str(voice_id):
-            voice_id = os.path.basename(voice_id).replace('.json', '')
+            voice_id = os.path.splitext(os.path.basename(voice_id))[0]
         
         # Map descriptive names back to IDs if needed
         voices = default_engine_settings[TTS_ENGINES['SUPERTONIC']].get('voices', {})
@@ -279,7 +364,56 @@ class SupertonicTTS:
         if voice_id not in voices and voice_id not in ['M1', 'M2', 'M3', 'F1', 'F2', 'F3', 'C1', 'C2', 'E1', 'E2']:
             voice_id = 'M1'
         
-        return os.path.join(self.model_dir, "voice_styles", f"{voice_id}.json")
+        voice_style_path = os.path.join(self.model_dir, "voice_styles", f"{voice_id}.npz")
+        self._voice_path_cache[session_voice] = voice_style_path
+        return voice_style_path
+
+    def _load_style(self, voice_style_path: str) -> Any:
+        """Load a voice style, reusing the parsed arrays while the file is unchanged"""
+        key = (voice_style_path, os.path.getmtime(voice_style_path))
+        style = self._STYLE_CACHE.get(key)
+        if style is None:
+            style = load_voice_style([voice_style_path])
+            if len(self._STYLE_CACHE) >= self._STYLE_CACHE_SIZE:
+                # FIFO eviction, dicts keep insertion order
+                self._STYLE_CACHE.pop(next(iter(self._STYLE_CACHE)))
+            self._STYLE_CACHE[key] = style
+        return style
+
+    def _as_float32(self, audio_data: np.ndarray) -> np.ndarray:
+        """Return the first channel as 1-D float32, casting into the reused buffer if needed"""
+        # Vocoder output is (1, samples), sf.write expects (samples,): take a view of the first row
+        audio_np = audio_data[0] if audio_data.ndim > 1 else audio_data
+        if audio_np.dtype == np.float32:
+            return audio_np
+        samples = audio_np.shape[0]
+        if self._audio_buf is None or self._audio_buf.shape[0] < samples:
+            self._audio_buf = np.empty(max(samples, self.samplerate * 60), dtype=np.float32)
+        out = self._audio_buf[:samples]
+        np.copyto(out, audio_np, casting='unsafe')
+        return out
+
+    def _get_style(self) -> Any:
+        """Get the style of the session voice, reloaded only when the voice changed"""
+        voice_style_path = self._get_voice_style_path()
+        log.debug("Supertonic: voice=%s path=%s", self.session.get('voice', 'M1'), voice_style_path)
+        
+        # Only resolve and load the style when the voice changed since the last sentence
+        if voice_style_path != self._current_voice_path:
+            if not os.path.exists(voice_style_path) and not self._migrate_json_voice_style(voice_style_path):
+                # Create default voice style
+                log.debug("Supertonic: creating voice style %s", voice_style_path)
+                self._create_default_voice_style(voice_style_path)
+            self._current_style = self._load_style(voice_style_path)
+            self._current_voice_path = voice_style_path
+        return self._current_style
+
+    def _write_sentence(self, sentence_number: int, audio_data: np.ndarray) -> None:
+        """Save the audio of one sentence to its numbered file"""
+        audio_np = self._as_float32(audio_data)
+        output_file = os.path.join(self.session['chapters_dir_sentences'], f'{sentence_number}.{default_audio_proc_format}')
+        import soundfile as sf
+        sf.write(output_file, audio_np, self.samplerate, subtype='PCM_16')
 
     def convert(self, sentence_number: int, sentence: str) -> bool:
         """Convert text to speech using Supertonic"""
@@ -288,37 +422,14 @@ class SupertonicTTS:
                 print("Supertonic engine not initialized")
                 return False
 
-            # Get voice style path
-            voice_style_path = self._get_voice_style_path()
-            voice_id = self.session.get('voice', 'M1')
-            print(f"DEBUG Supertonic: session['voice']={voice_id}, voice_style_path={voice_style_path}")
-            
-            if not os.path.exists(voice_style_path):
-                # Create default voice style
-                print(f"DEBUG Supertonic: Creating voice style for {voice_style_path}")
-                self._create_default_voice_style(voice_style_path)
-            
-            style = load_voice_style([voice_style_path])
-            print(f"DEBUG Supertonic: Loaded style, ttl shape={style.ttl.shape}, dp shape={style.dp.shape}")
-            print(f"DEBUG Supertonic: style_ttl[0,0,:5]={style.ttl[0,0,:5]}")  # First 5 values to verify different
+            style = self._get_style()
 
             # Convert text to speech
-            print(f"DEBUG Supertonic: speed={self.speed}, total_step={self.total_step}")
+            log.debug("Supertonic: speed=%s total_step=%s", self.speed, self.total_step)
             audio_data, duration = self.engine(sentence, style, self.total_step, self.speed)
 
             if audio_data is not None and len(audio_data) > 0:
-                # Convert to numpy array and ensure correct shape
-                audio_np = audio_data.astype(np.float32)
-                if len(audio_np.shape) == 1:
-                    audio_np = audio_np.reshape(1, -1)
-                elif audio_np.shape[0] != 1:
-                    audio_np = audio_np[:1, :]
-
-                # Save to file
-                output_file = os.path.join(self.session['chapters_dir_sentences'], f'{sentence_number}.{default_audio_proc_format}')
-                # audio_np is (1, samples), sf.write expects (samples,) or (samples, channels)
-                sf.write(output_file, audio_np.flatten(), self.samplerate)
-
+                self._write_sentence(sentence_number, audio_data)
                 return True
             else:
                 print("Empty audio generated")
@@ -334,8 +445,7 @@ class SupertonicTTS:
         return self.samplerate
 
     def cleanup(self) -> None:
-        """Clean up resources"""
+        """Clean up resources (the shared engine is released once loaded_tts drops it)"""
         if hasattr(self, 'engine') and self.engine:
-            del self.engine
             self.engine = None
         cleanup_memory()
\ No newline at end of file
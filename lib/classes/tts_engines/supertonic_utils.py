@@ -10,10 +10,22 @@ import onnxruntime as ort
 
 import re
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _load_json(path: str):
+    # orjson parses straight from bytes in C, json is the fallback when it is not installed
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r") as f:
+        return json.load(f)
+
 class UnicodeProcessor:
     def __init__(self, unicode_indexer_path: str):
-        with open(unicode_indexer_path, "r") as f:
-            self.indexer = json.load(f)
+        self.indexer = _load_json(unicode_indexer_path)
 
     def _preprocess_text(self, text: str) -> str:
         # Advanced normalizer for better performance
@@ -255,8 +267,10 @@ class TextToSpeech:
         text_enc_ort: ort.InferenceSession,
         vector_est_ort: ort.InferenceSession,
         vocoder_ort: ort.InferenceSession,
+        run_options: Optional[ort.RunOptions] = None,
     ):
         self.cfgs = cfgs
+        self.run_options = run_options
         self.text_processor = text_processor
         self.dp_ort = dp_ort
         self.text_enc_ort = text_enc_ort
@@ -266,6 +280,8 @@ class TextToSpeech:
         self.base_chunk_size = cfgs["ae"]["base_chunk_size"]
         self.chunk_compress_factor = cfgs["ttl"]["chunk_compress_factor"]
         self.ldim = cfgs["ttl"]["latent_dim"]
+        # Own generator instead of the legacy global np.random state
+        self.rng = np.random.default_rng()
 
     def sample_noisy_latent(
         self, duration: np.ndarray
@@ -276,7 +292,9 @@ class TextToSpeech:
         chunk_size = self.base_chunk_size * self.chunk_compress_factor
         latent_len = ((wav_len_max + chunk_size - 1) / chunk_size).astype(np.int32)
         latent_dim = self.ldim * self.chunk_compress_factor
-        noisy_latent = np.random.randn(bsz, latent_dim, latent_len).astype(np.float32)
+        noisy_latent = self.rng.standard_normal(
+            (bsz, latent_dim, int(latent_len)), dtype=np.float32
+        )
         latent_mask = get_latent_mask(
             wav_lengths, self.base_chunk_size, self.chunk_compress_factor
         )
@@ -292,12 +310,15 @@ class TextToSpeech:
         bsz = len(text_list)
         text_ids, text_mask = self.text_processor.process_text(text_list)
         dur_onnx, *_ = self.dp_ort.run(
-            None, {"text_ids": text_ids, "style_dp": style.dp, "text_mask": text_mask}
+            None,
+            {"text_ids": text_ids, "style_dp": style.dp, "text_mask": text_mask},
+            self.run_options,
         )
         dur_onnx = dur_onnx / speed
         text_emb_onnx, *_ = self.text_enc_ort.run(
             None,
             {"text_ids": text_ids, "style_ttl": style.ttl, "text_mask": text_mask},
+            self.run_options,
         )  # dur_onnx: [bsz]
         xt, latent_mask = self.sample_noisy_latent(dur_onnx)
         total_step_np = np.array([total_step] * bsz, dtype=np.float32)
@@ -315,8 +336,9 @@ class TextToSpeech:
                     "total_step": total_step_np,
                     "total_step": total_step_np,
                 },
+                self.run_options,
             )
-        wav, *_ = self.vocoder_ort.run(None, {"latent": xt})
+        wav, *_ = self.vocoder_ort.run(None, {"latent": xt}, self.run_options)
         return wav, dur_onnx
 
     def __call__(
@@ -380,8 +402,50 @@ def load_onnx(
 ) -> ort.InferenceSession:
     return ort.InferenceSession(onnx_path, sess_options=opts, providers=providers)
 
+def quantize_vector_estimator(onnx_dir: str, quant: str) -> Optional[str]:
+    """
+    Write a quantized copy of vector_estimator.onnx, the model run total_step times per text.
+
+    Args:
+        onnx_dir: model directory
+        quant: 'int8' (dynamic weight quantization) or 'fp16'
+
+    Returns:
+        path: the quantized model, or None if it could not be created
+    """
+    src = os.path.join(onnx_dir, "vector_estimator.onnx")
+    dst = os.path.join(onnx_dir, f"vector_estimator.{quant}.onnx")
+    if os.path.exists(dst):
+        return dst
+    tmp = f"{dst}.tmp"
+    try:
+        if quant == "int8":
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            quantize_dynamic(src, tmp, weight_type=QuantType.QInt8)
+        elif quant == "fp16":
+            import onnx
+            from onnxconverter_common import float16
+
+            # Keep float32 inputs/outputs so the rest of the pipeline is unchanged
+            model_fp16 = float16.convert_float_to_float16(onnx.load(src), keep_io_types=True)
+            onnx.save(model_fp16, tmp)
+        else:
+            raise ValueError(f"unsupported quantization {quant}")
+        os.replace(tmp, dst)
+    except Exception as e:
+        print(f"Could not quantize {src} to {quant}: {e}")
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return None
+    return dst
+
 def load_onnx_all(
-    onnx_dir: str, opts: ort.SessionOptions, providers: list[str]
+    onnx_dir: str,
+    opts: ort.SessionOptions,
+    providers: list[str],
+    quant: Optional[str] = None,
+    vector_est_opts: Optional[ort.SessionOptions] = None,
 ) -> tuple[
     ort.InferenceSession,
     ort.InferenceSession,
@@ -391,18 +455,21 @@ def load_onnx_all(
     dp_onnx_path = os.path.join(onnx_dir, "duration_predictor.onnx")
     text_enc_onnx_path = os.path.join(onnx_dir, "text_encoder.onnx")
     vector_est_onnx_path = os.path.join(onnx_dir, "vector_estimator.onnx")
+    if quant:
+        quant_onnx_path = os.path.join(onnx_dir, f"vector_estimator.{quant}.onnx")
+        if os.path.exists(quant_onnx_path):
+            vector_est_onnx_path = quant_onnx_path
     vocoder_onnx_path = os.path.join(onnx_dir, "vocoder.onnx")
 
     dp_ort = load_onnx(dp_onnx_path, opts, providers)
     text_enc_ort = load_onnx(text_enc_onnx_path, opts, providers)
-    vector_est_ort = load_onnx(vector_est_onnx_path, opts, providers)
+    vector_est_ort = load_onnx(vector_est_onnx_path, vector_est_opts or opts, providers)
     vocoder_ort = load_onnx(vocoder_onnx_path, opts, providers)
     return dp_ort, text_enc_ort, vector_est_ort, vocoder_ort
 
 def load_cfgs(onnx_dir: str) -> dict:
     cfg_path = os.path.join(onnx_dir, "tts.json")
-    with open(cfg_path, "r") as f:
-        cfgs = json.load(f)
+    cfgs = _load_json(cfg_path)
     return cfgs
 
 def load_text_processor(onnx_dir: str) -> UnicodeProcessor:
@@ -410,8 +477,48 @@ def load_text_processor(onnx_dir: str) -> UnicodeProcessor:
     text_processor = UnicodeProcessor(unicode_indexer_path)
     return text_processor
 
-def load_text_to_speech(onnx_dir: str, use_gpu: bool = False) -> TextToSpeech:
+def load_session_options(sess_options: Optional[dict] = None) -> ort.SessionOptions:
+    """
+    Build ort.SessionOptions from a plain dict.
+
+    Args:
+        sess_options: may hold intra_op_num_threads, enable_cpu_mem_arena
+            and enable_mem_pattern
+
+    Returns:
+        opts: session options shared by all Supertonic sessions
+    """
+    sess_options = sess_options or {}
     opts = ort.SessionOptions()
+    # Fold constants and fuse operators once at load, stages run one after another
+    opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    if "intra_op_num_threads" in sess_options:
+        opts.intra_op_num_threads = sess_options["intra_op_num_threads"]
+    if "enable_cpu_mem_arena" in sess_options:
+        opts.enable_cpu_mem_arena = sess_options["enable_cpu_mem_arena"]
+    if "enable_mem_pattern" in sess_options:
+        # Text length changes every call, memory patterns never get reused
+        opts.enable_mem_pattern = sess_options["enable_mem_pattern"]
+    if opts.enable_cpu_mem_arena:
+        opts.add_session_config_entry("memory.enable_memory_arena_shrinkage", "cpu:0")
+    return opts
+
+def load_text_to_speech(
+    onnx_dir: str,
+    use_gpu: bool = False,
+    sess_options: Optional[dict] = None,
+    quant: Optional[str] = None,
+) -> TextToSpeech:
+    opts = load_session_options(sess_options)
+    # The diffusion loop runs total_step times per text, keep denormals off its slow path
+    vector_est_opts = load_session_options(sess_options)
+    vector_est_opts.add_session_config_entry("session.set_denormal_as_zero", "1")
+    run_options = None
+    if opts.enable_cpu_mem_arena:
+        # Hand arena memory back after every run instead of keeping the peak
+        run_options = ort.RunOptions()
+        run_options.add_run_config_entry("memory.enable_memory_arena_shrinkage", "cpu:0")
     if use_gpu:
         raise NotImplementedError("GPU mode is not fully tested")
     else:
@@ -419,38 +526,34 @@ def load_text_to_speech(onnx_dir: str, use_gpu: bool = False) -> TextToSpeech:
         print("Using CPU for inference")
     cfgs = load_cfgs(onnx_dir)
     dp_ort, text_enc_ort, vector_est_ort, vocoder_ort = load_onnx_all(
-        onnx_dir, opts, providers
+        onnx_dir, opts, providers, quant, vector_est_opts
     )
     text_processor = load_text_processor(onnx_dir)
     return TextToSpeech(
-        cfgs, text_processor, dp_ort, text_enc_ort, vector_est_ort, vocoder_ort
+        cfgs, text_processor, dp_ort, text_enc_ort, vector_est_ort, vocoder_ort, run_options
     )
 
+def _read_voice_style(voice_style_path: str) -> tuple[np.ndarray, np.ndarray]:
+    """Read (style_ttl, style_dp) from a .npz archive or a legacy JSON file."""
+    if voice_style_path.endswith(".npz"):
+        with np.load(voice_style_path) as data:
+            ttl = data["style_ttl"].astype(np.float32, copy=False)
+            dp = data["style_dp"].astype(np.float32, copy=False)
+        return ttl.reshape(-1, *ttl.shape[-2:]), dp.reshape(-1, *dp.shape[-2:])
+
+    voice_style = _load_json(voice_style_path)
+    ttl_dims = voice_style["style_ttl"]["dims"]
+    dp_dims = voice_style["style_dp"]["dims"]
+    ttl = np.array(voice_style["style_ttl"]["data"], dtype=np.float32)
+    dp = np.array(voice_style["style_dp"]["data"], dtype=np.float32)
+    return ttl.reshape(1, ttl_dims[1], ttl_dims[2]), dp.reshape(1, dp_dims[1], dp_dims[2])
+
 def load_voice_style(voice_style_paths: list[str], verbose: bool = False) -> Style:
     bsz = len(voice_style_paths)
 
-    # Read first file to get dimensions
-    with open(voice_style_paths[0], "r") as f:
-        first_style = json.load(f)
-    ttl_dims = first_style["style_ttl"]["dims"]
-    dp_dims = first_style["style_dp"]["dims"]
-
-    # Pre-allocate arrays with full batch size
-    ttl_style = np.zeros([bsz, ttl_dims[1], ttl_dims[2]], dtype=np.float32)
-    dp_style = np.zeros([bsz, dp_dims[1], dp_dims[2]], dtype=np.float32)
-
-    # Fill in the data
-    for i, voice_style_path in enumerate(voice_style_paths):
-        with open(voice_style_path, "r") as f:
-            voice_style = json.load(f)
-
-        ttl_data = np.array(
-            voice_style["style_ttl"]["data"], dtype=np.float32
-        ).flatten()
-        ttl_style[i] = ttl_data.reshape(ttl_dims[1], ttl_dims[2])
-
-        dp_data = np.array(voice_style["style_dp"]["data"], dtype=np.float32).flatten()
-        dp_style[i] = dp_data.reshape(dp_dims[1], dp_dims[2])
+    styles = [_read_voice_style(p) for p in voice_style_paths]
+    ttl_style = np.concatenate([ttl for ttl, _ in styles], axis=0)
+    dp_style = np.concatenate([dp for _, dp in styles], axis=0)
 
     if verbose:
         print(f"Loaded {bsz} voice styles")
@@ -1,26 +1,72 @@
 import os
+import glob
 import tempfile
-print("DEBUG: LOADED VITS FROM", __file__)
-import regex as re
+import unicodedata
 import torch
-import torchaudio
 import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-import subprocess
-import shutil
-import uuid
 from typing import Any
 from pathlib import Path
-from huggingface_hub import hf_hub_download
 
-from lib.classes.vram_detector import VRAMDetector
 from lib.classes.tts_engines.common.utils import cleanup_memory, loaded_tts_size_gb
 from lib.classes.tts_engines.common.audio_filters import detect_gender, trim_audio, normalize_audio, is_audio_data_valid
-from lib import *
+from lib import tts_dir, language_tts, loaded_tts, default_audio_proc_format, TTS_SML
+from lib.conf import enable_torch_compile, torch_compile_mode, torch_compile_dynamic, cuda_benchmark_mode
 from lib.models import TTS_ENGINES, default_engine_settings, models, TTS_VOICE_CONVERSION, default_vc_model
 
 lock = threading.Lock()
 
+def _is_word_char(char: str) -> bool:
+    # Same set as regex \w: letters, digits, marks, connector punctuation and joiners
+    if char.isalnum() or char in '\u200c\u200d':
+        return True
+    category = unicodedata.category(char) if char else ''
+    return category[:1] == 'M' or category == 'Pc'
+
+@contextmanager
+def _mmap_checkpoints():
+    # Let Coqui's VITS load_checkpoint() map the .pth instead of reading it all into RAM first
+    try:
+        import TTS.tts.models.vits as coqui_vits
+        load_fsspec = coqui_vits.load_fsspec
+    except Exception:
+        load_fsspec = None
+    # Only the caller that installed the patch restores it, VITS and VC models may load concurrently
+    if load_fsspec is None or getattr(load_fsspec, '_mmap', False):
+        yield
+        return
+
+    def load_fsspec_mmap(path, map_location=None, cache=True, **kwargs):
+        if isinstance(path, (str, os.PathLike)) and os.path.isfile(path):
+            try:
+                # Same as the wrapped loader: never unpickle arbitrary objects from a (possibly user supplied) .pth
+                return torch.load(path, map_location=map_location, mmap=True, **{'weights_only': True, **kwargs})
+            except Exception as e:
+                error = f'_mmap_checkpoints() mmap load error: {e}, using legacy load'
+                print(error)
+        return load_fsspec(path, map_location=map_location, cache=cache, **kwargs)
+
+    load_fsspec_mmap._mmap = True
+    coqui_vits.load_fsspec = load_fsspec_mmap
+    try:
+        yield
+    finally:
+        coqui_vits.load_fsspec = load_fsspec
+
+class _MonoResample(torch.nn.Module):
+    # Channel mean + resample + squeeze as one module so it can be TorchScripted
+    def __init__(self, orig_sr: int, target_sr: int):
+        super().__init__()
+        import torchaudio
+        self.resampler = torchaudio.transforms.Resample(orig_freq=orig_sr, new_freq=target_sr)
+
+    def forward(self, waveform: torch.Tensor) -> torch.Tensor:
+        if waveform.size(0) > 1:
+            waveform = waveform.mean(dim=0, keepdim=True)
+        return self.resampler(waveform).squeeze(0)
+
 class VitsTTS:
     def __init__(self, session: Any):
         try:
@@ -38,28 +84,63 @@ class VitsTTS:
             }
             self.vtt_path = os.path.join(self.session['process_dir'], Path(self.session['final_name']).stem + '.vtt')
             self.resampler_cache = {}
+            self.target_wav_cache = {}
+            self.voice_gender_cache = {}
+            self.custom_model_files = {}
             self.audio_segments = []
-            self._load_engine()
-            self._load_engine_zs()
+            # cleanup_memory() stalls the pipeline (gc + empty_cache), run it every cleanup_interval saved sentences
+            self.cleanup_interval = 32
+            self.sentences_since_cleanup = 0
+            self.rng = np.random.default_rng()
+            self._silence_buf = torch.zeros(1, int(self.params['samplerate'] * 2.0))
+            self._out_buf = None
+            self._copy_event = None
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                future_zs = executor.submit(self._load_engine_zs)
+                self._load_engine()
+                future_zs.result()
         except Exception as e:
             error = f'__init__() error: {e}'
             print(error)
 
+    def _find_model_file(self, custom_model_path: str) -> str|None:
+        if custom_model_path not in self.custom_model_files:
+            model_file = None
+            for ext in ('*.pth', '*.pt'):
+                model_file = next(glob.iglob(os.path.join(glob.escape(custom_model_path), '**', ext), recursive=True), None)
+                if model_file:
+                    break
+            self.custom_model_files[custom_model_path] = model_file
+        return self.custom_model_files[custom_model_path]
+
     def _load_api(self, key: str, model_path: str, device: str) -> Any:
         global lock
         try:
+            # Cache hits are a plain dict read, the lock only guards registration
+            engine = loaded_tts.get(key, False)
+            if engine:
+                return engine
+            from TTS.api import TTS as TTSEngine
             with lock:
-                from TTS.api import TTS as TTSEngine
                 engine = loaded_tts.get(key, False)
-                if not engine:
-                    engine = TTSEngine(model_path)
                 if engine:
-                    vram_dict = VRAMDetector().detect_vram(self.session['device'])
-                    self.session['free_vram_gb'] = vram_dict.get('free_vram_gb', 0)
+                    return engine
+            # Built outside the lock so the VITS and VC checkpoints download and load in parallel
+            with _mmap_checkpoints():
+                engine = TTSEngine(model_path)
+            if engine:
+                from lib.classes.vram_detector import VRAMDetector
+                vram_dict = VRAMDetector().detect_vram(self.session['device'])
+                self.session['free_vram_gb'] = vram_dict.get('free_vram_gb', 0)
+                with lock:
+                    # Another worker may have registered the same model meanwhile, keep a single instance
+                    registered = loaded_tts.get(key, False)
+                    if registered:
+                        return registered
                     models_loaded_size_gb = loaded_tts_size_gb(loaded_tts)
                     if self.session['free_vram_gb'] > models_loaded_size_gb:
                         loaded_tts[key] = engine
-                return engine
+            return engine
         except Exception as e:
             error = f"_load_api() error: {e}"
             print(error)
@@ -109,14 +190,7 @@ class VitsTTS:
                         else:
                             # Use custom model files
                             # Find the model file (handle different naming conventions)
-                            model_file = None
-                            for root, dirs, files in os.walk(custom_model_path):
-                                for file in files:
-                                    if file.endswith('.pth') or file.endswith('.pt'):
-                                        model_file = os.path.join(root, file)
-                                        break
-                                if model_file:
-                                    break
+                            model_file = self._find_model_file(custom_model_path)
 
                             if model_file:
                                 model_path = os.path.dirname(model_file)
@@ -185,15 +259,73 @@ class VitsTTS:
             if self.engine:
                 msg = f'VITS {self.tts_key} Loaded!'
                 print(msg)
+                self._autocast_engine()
+                self._compile_engine()
         except Exception as e:
             error = f'_load_engine() error: {e}'
             print(error)
 
+    def _autocast_engine(self) -> None:
+        # Opt-in per session: bf16 autocast of the VITS generator on GPUs that support it
+        if not (self.session.get('vits_bf16_autocast', default_engine_settings[TTS_ENGINES['VITS']]['bf16_autocast']) and self.session['device'] == 'cuda' and torch.cuda.is_available() and torch.cuda.is_bf16_supported()):
+            return
+        tts_model = getattr(getattr(self.engine, 'synthesizer', None), 'tts_model', None)
+        if tts_model is None or getattr(tts_model, '_bf16_inference', False):
+            return
+        inference = tts_model.inference
+
+        def inference_bf16(*args, **kwargs):
+            with torch.autocast(device_type='cuda', dtype=torch.bfloat16):
+                outputs = inference(*args, **kwargs)
+            # Back to fp32 at the boundary, the synthesizer converts outputs to numpy which has no bf16
+            return {key: value.float() if torch.is_tensor(value) and value.is_floating_point() else value for key, value in outputs.items()}
+
+        tts_model.inference = inference_bf16
+        tts_model._bf16_inference = True
+
+    def _compile_engine(self) -> None:
+        # Opt-in per session: compiling costs a long first call, only worth it for whole books
+        if not (enable_torch_compile and self.session.get('vits_torch_compile', default_engine_settings[TTS_ENGINES['VITS']]['torch_compile']) and hasattr(torch, 'compile')):
+            return
+        tts_model = getattr(getattr(self.engine, 'synthesizer', None), 'tts_model', None)
+        if tts_model is None or getattr(tts_model, '_compiled_inference', False):
+            return
+        inference = tts_model.inference
+        try:
+            msg = f'Compiling VITS {self.tts_key} inference, please be patient...'
+            print(msg)
+            mode = torch_compile_mode if self.session['device'] == 'cuda' else 'default'
+            tts_model.inference = torch.compile(inference, mode=mode, fullgraph=False, dynamic=torch_compile_dynamic)
+            # Compilation is lazy, warm up here so failures and capture time stay out of convert()
+            self.engine.to(self.session['device'])
+            with torch.no_grad():
+                self.engine.tts(text='Warm up.', **self._speaker_argument())
+            tts_model._compiled_inference = True
+        except Exception as e:
+            tts_model.inference = inference
+            error = f'_compile_engine() error: {e}, using eager mode'
+            print(error)
+
+    def setup_performance(self) -> None:
+        # cudnn.benchmark is set by the performance optimizer, run one sentence so the
+        # decoder convolutions are autotuned before the first real sentence
+        if not (self.engine and cuda_benchmark_mode and self.session['device'] == 'cuda' and torch.cuda.is_available()):
+            return
+        tts_model = getattr(getattr(self.engine, 'synthesizer', None), 'tts_model', None)
+        if tts_model is not None and getattr(tts_model, '_compiled_inference', False):
+            return
+        try:
+            self.engine.to(self.session['device'])
+            with torch.no_grad():
+                self.engine.tts(text='Warm up.', **self._speaker_argument())
+        except Exception as e:
+            error = f'setup_performance() warm up error: {e}'
+            print(error)
+
     def _load_engine_zs(self) -> Any:
         try:
             msg = f"Loading ZeroShot {self.tts_zs_key} model, please be patient..."
             print(msg)
-            cleanup_memory()
             self.engine_zs = loaded_tts.get(self.tts_zs_key, False)
             if not self.engine_zs:
                 self.engine_zs = self._load_api(self.tts_zs_key, default_vc_model, self.session['device'])
@@ -201,10 +333,41 @@ class VitsTTS:
                 self.session['model_zs_cache'] = self.tts_zs_key
                 msg = f'ZeroShot {self.tts_zs_key} Loaded!'
                 print(msg)
+                self._memoize_target_encoder()
         except Exception as e:
             error = f'_load_engine_zs() error: {e}'
             print(error)
 
+    def _memoize_target_encoder(self) -> None:
+        # Coqui's voice_conversion() re-encodes the reference voice on every call (knnvc matching set,
+        # openvoice/freevc target embedding), the target tensor is the same object for the whole book.
+        # extract_se is left alone: openvoice also runs it on each sentence's source audio
+        vc_model = getattr(getattr(self.engine_zs, 'voice_converter', None), 'vc_model', None)
+        if vc_model is None or hasattr(vc_model, '_target_encoder_cache'):
+            return
+        name = next((name for name in ('_extract_target_se', 'get_matching_set') if hasattr(vc_model, name)), None)
+        if name is None:
+            return
+        encode = getattr(vc_model, name)
+        cache = {}
+
+        def encode_cached(target, *args, **kwargs):
+            targets = target if isinstance(target, (list, tuple)) else [target]
+            try:
+                key = (tuple(t if isinstance(t, str) else id(t) for t in targets), args, tuple(sorted(kwargs.items())))
+                hash(key)
+            except TypeError:
+                return encode(target, *args, **kwargs)
+            if key not in cache:
+                if len(cache) >= 8:
+                    cache.pop(next(iter(cache)))
+                # Keep the targets referenced so their id() cannot be reused while cached
+                cache[key] = (targets, encode(target, *args, **kwargs))
+            return cache[key][1]
+
+        setattr(vc_model, name, encode_cached)
+        vc_model._target_encoder_cache = cache
+
     def _tensor_type(self, audio_data: Any) -> torch.Tensor:
         if isinstance(audio_data, torch.Tensor):
             return audio_data
@@ -215,32 +378,86 @@ class VitsTTS:
         else:
             raise TypeError(f"Unsupported type for audio_data: {type(audio_data)}")
 
-    def _get_resampler(self, orig_sr: int, target_sr: int) -> torchaudio.transforms.Resample:
+    def _get_resampler(self, orig_sr: int, target_sr: int) -> torch.nn.Module:
         key = (orig_sr, target_sr)
         if key not in self.resampler_cache:
-            self.resampler_cache[key] = torchaudio.transforms.Resample(
-                orig_freq=orig_sr, new_freq=target_sr
-            )
+            resampler = _MonoResample(orig_sr, target_sr)
+            try:
+                # Scripted once per samplerate pair, reused for every sentence
+                resampler = torch.jit.script(resampler)
+            except Exception as e:
+                error = f'_get_resampler() torch.jit.script error: {e}'
+                print(error)
+            self.resampler_cache[key] = resampler
         return self.resampler_cache[key]
 
-    def _resample_wav(self, wav_path: str, expected_sr: int) -> str:
-        waveform, orig_sr = torchaudio.load(wav_path)
+    def _resample_tensor(self, waveform: torch.Tensor, orig_sr: int, expected_sr: int) -> torch.Tensor:
+        if waveform.dim() == 1:
+            waveform = waveform.unsqueeze(0)
         if orig_sr == expected_sr and waveform.size(0) == 1:
-            return wav_path
-        if waveform.size(0) > 1:
-            waveform = waveform.mean(dim=0, keepdim=True)
-        if orig_sr != expected_sr:
-            resampler = self._get_resampler(orig_sr, expected_sr)
-            waveform = resampler(waveform)
-        wav_tensor = waveform.squeeze(0)
-        wav_numpy = wav_tensor.cpu().numpy()
-        os.makedirs(tmp_dir, exist_ok=True)
-        tmp_fh = tempfile.NamedTemporaryFile(dir=tmp_dir, suffix=".wav", delete=False)
-        tmp_path = tmp_fh.name
-        tmp_fh.close()
-        import soundfile as sf
-        sf.write(tmp_path, wav_numpy, expected_sr, subtype="PCM_16")
-        return tmp_path
+            return waveform.squeeze(0)
+        return self._get_resampler(orig_sr, expected_sr)(waveform)
+
+    def _get_target_wav(self, voice_path: str, samplerate: int) -> torch.Tensor:
+        # The reference voice is the same for every sentence, load and resample it once
+        key = (voice_path, samplerate)
+        if key not in self.target_wav_cache:
+            import torchaudio
+            waveform, orig_sr = torchaudio.load(voice_path)
+            self.target_wav_cache[key] = self._resample_tensor(waveform, orig_sr, samplerate)
+        return self.target_wav_cache[key]
+
+    def _get_voice_gender(self, voice_path: str) -> str|None:
+        if voice_path not in self.voice_gender_cache:
+            self.voice_gender_cache[voice_path] = detect_gender(voice_path)
+        return self.voice_gender_cache[voice_path]
+
+    def _speaker_argument(self) -> dict:
+        speaker_argument = {}
+        if self.session['language'] == 'eng' and 'vctk/vits' in models[self.session['tts_engine']]['internal']['sub']:
+            if (self.session['language'] in models[self.session['tts_engine']]['internal']['sub']['vctk/vits'] or
+                self.session['language_iso1'] in models[self.session['tts_engine']]['internal']['sub']['vctk/vits']):
+                speaker_argument = {"speaker": 'p262'}
+        elif self.session['language'] == 'cat' and 'custom/vits' in models[self.session['tts_engine']]['internal']['sub']:
+            if (self.session['language'] in models[self.session['tts_engine']]['internal']['sub']['custom/vits'] or
+                self.session['language_iso1'] in models[self.session['tts_engine']]['internal']['sub']['custom/vits']):
+                speaker_argument = {"speaker": '09901'}
+        return speaker_argument
+
+    def _to_cpu(self, tensor: torch.Tensor) -> torch.Tensor:
+        # Device output lands in a reused pinned buffer, it is consumed before the next sentence.
+        # The copy is asynchronous, _wait_copy() runs before the samples are read on the host
+        if tensor.device.type != 'cuda':
+            return tensor
+        samples = tensor.numel()
+        if self._out_buf is None or self._out_buf.numel() < samples:
+            self._out_buf = torch.empty(samples, dtype=torch.float32, pin_memory=True)
+        out = self._out_buf[:samples].view(tensor.shape)
+        out.copy_(tensor, non_blocking=True)
+        self._copy_event = torch.cuda.Event()
+        self._copy_event.record()
+        return out
+
+    def _wait_copy(self) -> None:
+        # Host reads of the pinned buffer must wait for the pending device copy
+        if self._copy_event is not None:
+            self._copy_event.synchronize()
+            self._copy_event = None
+
+    def _silence(self, silence_time: float) -> torch.Tensor:
+        # Read-only view on a shared zero buffer, torch.cat() copies it anyway
+        samples = int(self.params['samplerate'] * silence_time)
+        if samples > self._silence_buf.shape[-1]:
+            self._silence_buf = torch.zeros(1, samples)
+        return self._silence_buf[:, :samples]
+
+    def _prepare_sentence(self, sentence: str) -> str:
+        # Text as sent to the model, convert() already handled break/pause markers
+        last = sentence[-1]
+        if last == "'":
+            sentence = sentence[:-1]
+            last = sentence[-1]
+        return sentence + '—' if last.isalnum() else sentence
 
     def convert(self, sentence_index: int, sentence: str) -> bool:
         try:
@@ -253,54 +470,47 @@ class VitsTTS:
             )
 
             if self.engine:
+                import torchaudio
                 self.engine.to(self.session['device'])
                 final_sentence_file = os.path.join(self.session['chapters_dir_sentences'], f'{sentence_index}.{default_audio_proc_format}')
 
                 if sentence == TTS_SML['break']:
-                    silence_time = int(np.random.uniform(0.3, 0.6) * 100) / 100
-                    break_tensor = torch.zeros(1, int(settings['samplerate'] * silence_time))
-                    self.audio_segments.append(break_tensor.clone())
+                    silence_time = int(self.rng.uniform(0.3, 0.6) * 100) / 100
+                    self.audio_segments.append(self._silence(silence_time))
                     return True
                 elif not sentence.replace('—', '').strip() or sentence == TTS_SML['pause']:
-                    silence_time = int(np.random.uniform(1.0, 1.8) * 100) / 100
-                    pause_tensor = torch.zeros(1, int(settings['samplerate'] * silence_time))
-                    self.audio_segments.append(pause_tensor.clone())
+                    silence_time = int(self.rng.uniform(1.0, 1.8) * 100) / 100
+                    self.audio_segments.append(self._silence(silence_time))
                     return True
                 else:
-                    if sentence.endswith("'"):
-                        sentence = sentence[:-1]
-
+                    sentence = self._prepare_sentence(sentence)
                     trim_audio_buffer = 0.004
-                    sentence += '—' if sentence[-1].isalnum() else ''
-
-                    speaker_argument = {}
-                    if self.session['language'] == 'eng' and 'vctk/vits' in models[self.session['tts_engine']]['internal']['sub']:
-                        if (self.session['language'] in models[self.session['tts_engine']]['internal']['sub']['vctk/vits'] or
-                            self.session['language_iso1'] in models[self.session['tts_engine']]['internal']['sub']['vctk/vits']):
-                            speaker_argument = {"speaker": 'p262'}
-                    elif self.session['language'] == 'cat' and 'custom/vits' in models[self.session['tts_engine']]['internal']['sub']:
-                        if (self.session['language'] in models[self.session['tts_engine']]['internal']['sub']['custom/vits'] or
-                            self.session['language_iso1'] in models[self.session['tts_engine']]['internal']['sub']['custom/vits']):
-                            speaker_argument = {"speaker": '09901'}
+                    # Alphanumeric endings got a '—' from _prepare_sentence, the last char decides trim and pause
+                    ends_with_dash = sentence[-1] == '—'
+                    needs_break = not ends_with_dash and not _is_word_char(sentence[-1])
 
-                    if settings['voice_path'] is not None:
-                        proc_dir = os.path.join(self.session['voice_dir'], 'proc')
-                        os.makedirs(proc_dir, exist_ok=True)
-                        tmp_in_wav = os.path.join(proc_dir, f"{uuid.uuid4()}.wav")
-                        tmp_out_wav = os.path.join(proc_dir, f"{uuid.uuid4()}.wav")
+                    speaker_argument = self._speaker_argument()
 
+                    if settings['voice_path'] is not None:
+                        # Keep the builtin voice in memory from TTS output through voice conversion
                         with torch.no_grad():
-                            self.engine.tts_to_file(
+                            audio_sentence = self.engine.tts(
                                 text=sentence,
-                                file_path=tmp_in_wav,
                                 **speaker_argument
                             )
+                        tts_samplerate = self.engine.synthesizer.output_sample_rate
+                        source_tensor = self._tensor_type(audio_sentence).unsqueeze(0)
 
                         if settings['voice_path'] in settings['semitones'].keys():
                             semitones = settings['semitones'][settings['voice_path']]
                         elif os.path.exists(settings['voice_path']):
-                            voice_path_gender = detect_gender(settings['voice_path'])
-                            voice_builtin_gender = detect_gender(tmp_in_wav)
+                            proc_dir = os.path.join(self.session['voice_dir'], 'proc')
+                            os.makedirs(proc_dir, exist_ok=True)
+                            voice_path_gender = self._get_voice_gender(settings['voice_path'])
+                            with tempfile.TemporaryDirectory(dir=proc_dir) as td:
+                                tmp_in_wav = os.path.join(td, 'builtin.wav')
+                                torchaudio.save(tmp_in_wav, source_tensor, tts_samplerate, encoding='PCM_S', bits_per_sample=16)
+                                voice_builtin_gender = detect_gender(tmp_in_wav)
                             msg = f"Cloned voice seems to be {voice_path_gender}\nBuiltin voice seems to be {voice_builtin_gender}"
                             print(msg)
                             if voice_builtin_gender != voice_path_gender:
@@ -315,23 +525,17 @@ class VitsTTS:
 
                         if semitones > 0:
                             try:
-                                cmd = [
-                                    shutil.which('sox'), tmp_in_wav,
-                                    "-r", str(settings['samplerate']), tmp_out_wav,
-                                    "pitch", str(semitones * 100)
-                                ]
-                                subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                            except (subprocess.CalledProcessError, FileNotFoundError) as e:
-                                error = f"Subprocess error: {e}"
+                                with torch.no_grad():
+                                    source_tensor = torchaudio.functional.pitch_shift(source_tensor, tts_samplerate, n_steps=semitones)
+                            except Exception as e:
+                                error = f"pitch_shift error: {e}"
                                 print(error)
                                 return False
-                        else:
-                            tmp_out_wav = tmp_in_wav
 
                         if self.engine_zs:
                             settings['samplerate'] = TTS_VOICE_CONVERSION[self.tts_zs_key]['samplerate']
-                            source_wav = self._resample_wav(tmp_out_wav, settings['samplerate'])
-                            target_wav = self._resample_wav(settings['voice_path'], settings['samplerate'])
+                            source_wav = self._resample_tensor(source_tensor, tts_samplerate, settings['samplerate'])
+                            target_wav = self._get_target_wav(settings['voice_path'], settings['samplerate'])
                             audio_sentence = self.engine_zs.voice_conversion(
                                 source_wav=source_wav,
                                 target_wav=target_wav
@@ -340,13 +544,6 @@ class VitsTTS:
                             error = f'Engine {self.tts_zs_key} is None'
                             print(error)
                             return False
-
-                        if os.path.exists(tmp_in_wav):
-                            os.remove(tmp_in_wav)
-                        if os.path.exists(tmp_out_wav):
-                            os.remove(tmp_out_wav)
-                        if os.path.exists(source_wav):
-                            os.remove(source_wav)
                     else:
                         with torch.no_grad():
                             audio_sentence = self.engine.tts(
@@ -355,21 +552,24 @@ class VitsTTS:
                             )
 
                     if is_audio_data_valid(audio_sentence):
-                        sourceTensor = self._tensor_type(audio_sentence)
-                        audio_tensor = sourceTensor.clone().detach().unsqueeze(0).cpu()
+                        sourceTensor = self._tensor_type(audio_sentence).detach()
 
-                        if sentence[-1].isalnum() or sentence[-1] == '—':
-                            audio_tensor = trim_audio(audio_tensor.squeeze(), settings['samplerate'], 0.001, trim_audio_buffer).unsqueeze(0)
+                        if ends_with_dash:
+                            sourceTensor = trim_audio(sourceTensor.squeeze(), settings['samplerate'], 0.001, trim_audio_buffer, keep_device=True)
+                        audio_tensor = self._to_cpu(sourceTensor.unsqueeze(0))
 
                         if audio_tensor is not None and audio_tensor.numel() > 0:
                             self.audio_segments.append(audio_tensor)
-                            if not re.search(r'\w$', sentence, flags=re.UNICODE) and sentence[-1] != '—':
-                                silence_time = int(np.random.uniform(0.3, 0.6) * 100) / 100
-                                break_tensor = torch.zeros(1, int(settings['samplerate'] * silence_time))
-                                self.audio_segments.append(break_tensor.clone())
+                            if needs_break:
+                                silence_time = int(self.rng.uniform(0.3, 0.6) * 100) / 100
+                                self.audio_segments.append(self._silence(silence_time))
 
                             if self.audio_segments:
-                                audio_tensor = torch.cat(self.audio_segments, dim=-1)
+                                self._wait_copy()
+                                if len(self.audio_segments) == 1:
+                                    audio_tensor = self.audio_segments[0]
+                                else:
+                                    audio_tensor = torch.cat(self.audio_segments, dim=-1)
                                 start_time = self.sentences_total_time
                                 duration = round((audio_tensor.shape[-1] / settings['samplerate']), 2)
                                 end_time = start_time + duration
@@ -388,7 +588,10 @@ class VitsTTS:
                                 if self.sentence_idx:
                                     torchaudio.save(final_sentence_file, audio_tensor, settings['samplerate'], format=default_audio_proc_format)
                                     del audio_tensor
-                                    cleanup_memory()
+                                    self.sentences_since_cleanup += 1
+                                    if self.sentences_since_cleanup >= self.cleanup_interval:
+                                        cleanup_memory()
+                                        self.sentences_since_cleanup = 0
 
                             self.audio_segments = []
                             if os.path.exists(final_sentence_file):
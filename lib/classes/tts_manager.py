@@ -2,7 +2,9 @@ import os
 import warnings
 
 from typing import Any
+
 from lib.models import TTS_ENGINES
+from lib.conf import tts_dir
 
 # Import performance optimizer
 try:
@@ -17,6 +19,8 @@ class TTSManager:
     def __init__(self, session:Any)->None:
         self.session = session
         self.engine = False
+        # Engines compile (and warm up) while loading, so the inductor cache must be set up first
+        self._setup_compile_cache()
         if self.session['tts_engine'] in TTS_ENGINES.values():
             if self.session['tts_engine'] == TTS_ENGINES['XTTSv2']:
                 from lib.classes.tts_engines.coqui import Coqui
@@ -45,6 +49,11 @@ class TTSManager:
         else:
             print('Other TTS engines coming soon!')
 
+    def _setup_compile_cache(self) -> None:
+        """Keep torch.compile artifacts across runs so restarts skip the inductor compile phase"""
+        os.environ.setdefault('TORCHINDUCTOR_CACHE_DIR', os.path.join(tts_dir, 'inductor_cache'))
+        os.environ.setdefault('TORCHINDUCTOR_FX_GRAPH_CACHE', '1')
+
     def convert_sentence2audio(self,sentence_number:int, sentence:str)->bool:
         try:
             if self.session['tts_engine'] in TTS_ENGINES.values():
@@ -1,4 +1,5 @@
 import os
+import importlib.util
 import platform
 import tempfile
 import sys
@@ -35,6 +36,9 @@ os.environ['DO_NOT_TRACK'] = 'True'
 os.environ['HUGGINGFACE_HUB_CACHE'] = tts_dir
 os.environ['HF_HOME'] = tts_dir
 os.environ['HF_DATASETS_CACHE'] = tts_dir
+# huggingface_hub reads this once on import, use the multi-connection rust downloader when installed
+if importlib.util.find_spec('hf_transfer') is not None:
+    os.environ.setdefault('HF_HUB_ENABLE_HF_TRANSFER', '1')
 os.environ['BARK_CACHE_DIR'] = tts_dir
 os.environ['TTS_CACHE'] = tts_dir
 os.environ['TORCH_HOME'] = tts_dir
@@ -174,6 +174,9 @@ class SessionContext:
                 "xtts_enable_text_splitting": default_engine_settings[TTS_ENGINES['XTTSv2']]['enable_text_splitting'],
                 "bark_text_temp": default_engine_settings[TTS_ENGINES['BARK']]['text_temp'],
                 "bark_waveform_temp": default_engine_settings[TTS_ENGINES['BARK']]['waveform_temp'],
+                "vits_torch_compile": default_engine_settings[TTS_ENGINES['VITS']]['torch_compile'],
+                "vits_bf16_autocast": default_engine_settings[TTS_ENGINES['VITS']]['bf16_autocast'],
+                "supertonic_quant": default_engine_settings[TTS_ENGINES['SUPERTONIC']]['quant'],
                 "final_name": None,
                 "output_format": default_output_format,
                 "output_channel": default_output_channel,
@@ -2407,6 +2410,9 @@ def convert_ebook(args:dict)->tuple:
                 session['xtts_enable_text_splitting'] = bool(args['xtts_enable_text_splitting'])
                 session['bark_text_temp'] =  float(args['bark_text_temp'])
                 session['bark_waveform_temp'] =  float(args['bark_waveform_temp'])
+                session['vits_torch_compile'] = bool(args.get('vits_torch_compile', default_engine_settings[TTS_ENGINES['VITS']]['torch_compile']))
+                session['vits_bf16_autocast'] = bool(args.get('vits_bf16_autocast', default_engine_settings[TTS_ENGINES['VITS']]['bf16_autocast']))
+                session['supertonic_quant'] = args.get('supertonic_quant', default_engine_settings[TTS_ENGINES['SUPERTONIC']]['quant'])
                 session['audiobooks_dir'] = str(args['audiobooks_dir']) if args['audiobooks_dir'] else None
                 session['output_format'] = str(args['output_format'])
                 session['output_split'] = bool(args['output_split'])
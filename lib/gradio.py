@@ -1,59 +1,48 @@
 from __future__ import annotations
 import os
+import sys
 import shutil
-from lib.functions import *
-from lib.classes.translator import get_translation_languages
+from collections import namedtuple
+from functools import lru_cache
+from lib.functions import (
+    Any, DictProxy, JSONDictProxyEncoder, Lang, MappingProxyType, Path, TTS_ENGINES, VoiceExtractor,
+    active_sessions, alert_exception, analyze_uploaded_file, audiobooks_gradio_dir, audiobooks_host_dir,
+    cleanup_session, context, context_tracker, convert_ebook, default_device, default_engine_settings,
+    default_fine_tuned, default_output_channel, default_output_format, default_output_split,
+    default_output_split_hours, default_tts_engine, delete_unused_tmp_dirs, devices, ebook_formats,
+    extract_custom_model, extract_preview_chapters, get_all_ip_addresses, get_compatible_tts_engines,
+    get_sanitized, glob, gr, hash_proxy_dict, hashlib, interface_component_options, interface_port,
+    interface_shared_tmp_expire, json, language_mapping, language_tts, max_custom_model, max_custom_voices,
+    mediainfo, models, models_dir, output_formats, platform, prog_version, re, reset_session,
+    restore_session_from_data, show_alert, tmp_dir, tmp_expire, update_session_chapters, uuid,
+    voice_formats, voices_dir
+)
 import tempfile
 
-def update_gr_save_session(session, state_update):
-    return gr.update(), gr.update(), gr.update()
+# language_mapping is static, build the dropdown labels and choices once at import
+_LANGUAGE_LABELS = {
+    sys.intern(lang): sys.intern(details['name'] if details['name'] == details['native_name'] else f"{details['name']} - {details['native_name']}")
+    for lang, details in language_mapping.items()
+}
+_LANGUAGE_OPTIONS = tuple((label, lang) for lang, label in _LANGUAGE_LABELS.items())
 
-def clear_event(session):
-    pass
+# lib.conf points tempfile at tmp_dir before this module loads, the gradio upload cache lives there
+_TMP_DIR_NORM = os.path.normpath(tempfile.gettempdir())
 
-def build_interface(args:dict)->gr.Blocks:
-    try:
-        script_mode = args['script_mode']
-        is_gui_process = args['is_gui_process']
-        is_gui_shared = args['share']
-        title = 'Ebook2Audiobook'
-        gr_glassmask_msg = 'Initialization, please wait...'
-        ebook_src = None
-        gr_session = None
-        gr_state_update = None
-        gr_save_session = None
-        gr_audiobook_list = None
-        language_options = [
-            (
-                f"{details['name']} - {details['native_name']}" if details['name'] != details['native_name'] else details['name'],
-                lang
-            )
-            for lang, details in language_mapping.items()
-        ]
-        voice_options = []
-        tts_engine_options = []
-        custom_model_options = []
-        fine_tuned_options = []
-        audiobook_options = []
-        options_output_split_hours = ['1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12']
-        
-        src_label_file = 'Upload File'
-        src_label_dir = 'Select a Directory'
-        
-        visible_gr_tab_xtts_params = interface_component_options['gr_tab_xtts_params']
-        visible_gr_tab_bark_params = interface_component_options['gr_tab_bark_params']
-        visible_gr_group_custom_model = interface_component_options['gr_group_custom_model']
-        visible_gr_group_voice_file = interface_component_options['gr_group_voice_file']
-
-        theme = gr.themes.Origin(
-            primary_hue='green',
-            secondary_hue='amber',
-            neutral_hue='gray',
-            radius_size='lg',
-            font_mono=['JetBrains Mono', 'monospace', 'Consolas', 'Menlo', 'Liberation Mono']
-        )
-
-        header_css = '''
+_SPLIT_HOURS = ('1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12')
+
+# Strings are kept as-is, comments dropped, whitespace collapsed
+_CSS_TOKENS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|(?:\s+|/\*.*?\*/)+', re.S)
+_CSS_PUNCT_SPACES = re.compile(r'\s*([{};,])\s*')
+_STYLE_TAGS = re.compile(r'</?style>')
+
+def _minify_css(css:str)->str:
+    # The <style> wrappers are not CSS, left in they swallow the first rule as a bogus selector
+    css = _STYLE_TAGS.sub('', css)
+    css = _CSS_TOKENS.sub(lambda m: m.group(1) or ' ', css)
+    return _CSS_PUNCT_SPACES.sub(r'\1', css).strip()
+
+_HEADER_CSS = _minify_css('''
             <style>
                 /* Global Scrollbar Customization */
                 /* The entire scrollbar */
@@ -158,10 +147,6 @@ def build_interface(args:dict)->gr.Blocks:
                     font-size: 30px !important;
                     color: var(--body-background-fill) !important;
                 }
-                .file-preview-holder {
-                    height: 116px !important;
-                    overflow: auto !important;
-                }
                 .progress-bar.svelte-ls20lj {
                     background: var(--secondary-500) !important;
                 }
@@ -170,6 +155,7 @@ def build_interface(args:dict)->gr.Blocks:
                     min-height: 0 !important;
                     max-height: none !important;
                     position: relative !important;
+                    overflow: auto !important;
                 }
                 .progress-text {
                     position: absolute !important;
@@ -665,7 +651,7 @@ def build_interface(args:dict)->gr.Blocks:
                     font-size: 0.9rem;
                     font-weight: 500;
                     cursor: pointer;
-                    transition: all 0.2s ease;
+                    transition: transform 0.2s ease, box-shadow 0.2s ease, background-color 0.2s ease;
                 }
                 
                 .translation-btn-primary {
@@ -686,8 +672,43 @@ def build_interface(args:dict)->gr.Blocks:
                 .translation-btn-secondary:hover {
                     background: #4b5563;
                 }
+
+                .injected-cancel-container {
+                    margin-top: 20px;
+                    padding: 15px;
+                    border-top: 1px solid var(--border-color-primary, #e5e7eb);
+                    display: flex;
+                    justify-content: flex-end;
+                }
+
+                .injected-cancel-btn {
+                    background-color: #ef4444;
+                    color: white;
+                    padding: 10px 20px;
+                    border-radius: 6px;
+                    border: none;
+                    font-weight: bold;
+                    cursor: pointer;
+                    width: 100%;
+                    font-size: 14px;
+                    transition: background-color 0.2s, transform 0.2s;
+                    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
+                }
+
+                .injected-cancel-btn:hover:not(:disabled) {
+                    background-color: #dc2626;
+                    transform: translateY(-1px);
+                }
+
+                .injected-cancel-btn:disabled {
+                    background-color: #6b7280;
+                    cursor: default;
+                }
             </style>
-            </style>
+        ''')
+
+# Only injected when the performance components are enabled in interface_component_options
+_PERFORMANCE_CSS = _minify_css('''
             <style>
                 /* Performance Optimization UI Elements */
                 .performance-status {
@@ -699,7 +720,7 @@ def build_interface(args:dict)->gr.Blocks:
                     font-size: 12px;
                     font-weight: bold;
                     margin: 4px 0;
-                    transition: all 0.3s ease;
+                    transition: opacity 0.3s ease, box-shadow 0.3s ease;
                 }
 
                 .performance-status.enabled {
@@ -728,11 +749,10 @@ def build_interface(args:dict)->gr.Blocks:
                 }
 
                 .metric-item {
-                    background: rgba(255, 255, 255, 0.1);
+                    background: rgba(255, 255, 255, 0.15);
                     padding: 4px 8px;
                     border-radius: 4px;
                     font-size: 10px;
-                    backdrop-filter: blur(4px);
                 }
 
                 .performance-modal {
@@ -742,6 +762,7 @@ def build_interface(args:dict)->gr.Blocks:
                     padding: 20px;
                     max-width: 500px;
                     box-shadow: 0 8px 16px rgba(255, 165, 0, 0.3);
+                    contain: layout paint style;
                 }
 
                 .performance-chart {
@@ -769,6 +790,7 @@ def build_interface(args:dict)->gr.Blocks:
                     background: linear-gradient(90deg, #4CAF50, #FFEB3B, #F44336);
                     transition: width 0.5s ease;
                     position: relative;
+                    contain: layout paint;
                 }
 
                 .gauge-label {
@@ -810,7 +832,7 @@ def build_interface(args:dict)->gr.Blocks:
                     right: 0;
                     bottom: 0;
                     background-color: #ccc;
-                    transition: .4s;
+                    transition: background-color .4s;
                     border-radius: 30px;
                 }
 
@@ -822,7 +844,8 @@ def build_interface(args:dict)->gr.Blocks:
                     left: 4px;
                     bottom: 4px;
                     background-color: white;
-                    transition: .4s;
+                    transition: transform .4s;
+                    will-change: transform;
                     border-radius: 50%;
                 }
 
@@ -840,6 +863,7 @@ def build_interface(args:dict)->gr.Blocks:
                     border-radius: 8px;
                     padding: 12px;
                     margin: 8px 0;
+                    contain: layout paint style;
                 }
 
                 .setting-row {
@@ -887,6 +911,7 @@ def build_interface(args:dict)->gr.Blocks:
                     background: rgba(255, 255, 255, 0.1);
                     border-radius: 2px;
                     overflow: hidden;
+                    contain: paint;
                 }
 
                 .progress-enhancer::after {
@@ -894,184 +919,34 @@ def build_interface(args:dict)->gr.Blocks:
                     position: absolute;
                     top: 0;
                     left: 0;
-                    right: 0;
+                    width: 100%;
                     bottom: 0;
                     background: linear-gradient(90deg, transparent, rgba(255, 255, 255, 0.3), transparent);
+                    will-change: transform;
                     animation: shine 2s infinite;
                 }
 
                 @keyframes shine {
-                    0% { left: -100%; }
-                    100% { left: 100%; }
+                    0% { transform: translateX(-100%); }
+                    100% { transform: translateX(100%); }
                 }
             </style>
-        '''
-        
-        # JavaScript for translation overlay (passed via js parameter)
-        header_js = """
-        function() {
-            // Global translation overlay functions
-            window.closeTranslationOverlay = function() {
-                console.log('closeTranslationOverlay called');
-                var overlay = document.getElementById('gr_translation_overlay');
-                if (overlay) {
-                    overlay.style.display = 'none';
-                    console.log('Overlay hidden');
-                }
-            };
-            
-            window.startTranslation = function() {
-                console.log('startTranslation called');
-                var targetLang = document.getElementById('translation_target_lang');
-                var service = document.getElementById('translation_service');
-                
-                if (!targetLang || !service) {
-                    console.log('Translation inputs not found');
-                    return;
-                }
-                
-                var targetLangValue = targetLang.value;
-                var serviceValue = service.value;
-                console.log('Target:', targetLangValue, 'Service:', serviceValue);
-                
-                // Show progress
-                var progressEl = document.getElementById('translation_progress');
-                var statusEl = document.getElementById('translation_status');
-                var startBtn = document.getElementById('start_translation_btn');
-                
-                if (progressEl) progressEl.style.display = 'block';
-                if (statusEl) statusEl.textContent = 'Starting translation...';
-                if (startBtn) startBtn.disabled = true;
-                
-                // Set hidden Gradio component values - service change triggers the translation
-                var targetInput = document.querySelector('#gr_translation_target_lang input, #gr_translation_target_lang textarea');
-                var serviceInput = document.querySelector('#gr_translation_service input, #gr_translation_service textarea');
-                
-                console.log('targetInput:', targetInput, 'serviceInput:', serviceInput);
-                
-                // First set target lang (this won't trigger anything)
-                if (targetInput) {
-                    targetInput.value = targetLangValue;
-                    targetInput.dispatchEvent(new Event('input', {bubbles: true}));
-                    console.log('Set target lang:', targetLangValue);
-                }
-                
-                // Close overlay after a short delay
-                setTimeout(function() {
-                    window.closeTranslationOverlay();
-                    
-                    // Then set service (this WILL trigger the translation via .change() handler)
-                    if (serviceInput) {
-                        // Append timestamp to make it unique and trigger change
-                        serviceInput.value = serviceValue + '_' + Date.now();
-                        serviceInput.dispatchEvent(new Event('input', {bubbles: true}));
-                        serviceInput.dispatchEvent(new Event('change', {bubbles: true}));
-                        console.log('Set service with trigger:', serviceValue);
-                    }
-                }, 200);
-            };
-            
-            console.log('Translation functions registered');
-            
-            // Inject Cancel Job Button into Settings
-            window.injectCancelButton = function() {
-                var headings = document.querySelectorAll('h2, h3, h4, span, div'); 
-                var screenStudioAnchor = null;
-                
-                // Strategy 1: Look for "Screen Studio" text (loose match for BETA badge)
-                for (var i = 0; i < headings.length; i++) {
-                    var el = headings[i];
-                    if (el.textContent && el.textContent.includes('Screen Studio')) {
-                        // Prioritize headers or short labels to avoid description text
-                        if (el.tagName.match(/^H\d/) || el.textContent.length < 40) {
-                             screenStudioAnchor = el;
-                             break;
-                        }
-                    }
-                }
-                
-                // Strategy 2: Fallback to "Start Recording" button if header not found
-                if (!screenStudioAnchor) {
-                     var buttons = document.querySelectorAll('button');
-                     for (var j = 0; j < buttons.length; j++) {
-                         if (buttons[j].textContent.includes('Start Recording')) {
-                             screenStudioAnchor = buttons[j];
-                             break;
-                         }
-                     }
-                }
-
-                if (screenStudioAnchor) {
-                    // Try to find the section container
-                    var section = screenStudioAnchor.closest('div.setting, section, .settings-section');
-                    if (!section) section = screenStudioAnchor.parentElement; 
-                    if (!section) section = screenStudioAnchor; // Last resort
-                    
-                    if (section && !document.getElementById('injected_cancel_job_btn')) {
-                        console.log('Found Screen Studio section, injecting Cancel button');
-                        var btnContainer = document.createElement('div');
-                        btnContainer.style.marginTop = '20px';
-                        btnContainer.style.padding = '15px';
-                        btnContainer.style.borderTop = '1px solid var(--border-color-primary, #e5e7eb)';
-                        btnContainer.style.display = 'flex';
-                        btnContainer.style.justifyContent = 'flex-end'; // Align right or center
-                        
-                        var btn = document.createElement('button');
-                        btn.id = 'injected_cancel_job_btn';
-                        btn.textContent = '🛑 Cancel Current Job';
-                        btn.style.backgroundColor = '#ef4444'; // Red
-                        btn.style.color = 'white';
-                        btn.style.padding = '10px 20px';
-                        btn.style.borderRadius = '6px';
-                        btn.style.border = 'none';
-                        btn.style.fontWeight = 'bold';
-                        btn.style.cursor = 'pointer';
-                        btn.style.width = '100%';
-                        btn.style.fontSize = '14px';
-                        btn.style.transition = 'all 0.2s';
-                        btn.style.boxShadow = '0 2px 4px rgba(0,0,0,0.1)';
-                        
-                        btn.onmouseover = function() { btn.style.backgroundColor = '#dc2626'; btn.style.transform = 'translateY(-1px)'; };
-                        btn.onmouseout = function() { btn.style.backgroundColor = '#ef4444'; btn.style.transform = 'translateY(0)'; };
-                        
-                        btn.onclick = function() {
-                            var hiddenBtn = document.getElementById('gr_cancel_job_btn');
-                            if (hiddenBtn) {
-                                hiddenBtn.click();
-                                btn.textContent = '⏳ Requesting Cancellation...';
-                                btn.disabled = true;
-                                btn.style.backgroundColor = '#6b7280';
-                                setTimeout(function() { 
-                                    btn.textContent = '🛑 Cancel Current Job'; 
-                                    btn.disabled = false;
-                                    btn.style.backgroundColor = '#ef4444';
-                                }, 3000);
-                            } else {
-                                console.error('Hidden cancel button not found');
-                            }
-                        };
-                        
-                        btnContainer.appendChild(btn);
-                        
-                        // Insert AFTER the section container to appear "underneath"
-                        if (section.parentNode) {
-                             if (section.nextSibling) {
-                                section.parentNode.insertBefore(btnContainer, section.nextSibling);
-                            } else {
-                                section.parentNode.appendChild(btnContainer);
-                            }
-                        }
-                    }
-                }
-            };
-            
-            // Run injection check periodically
-            setInterval(window.injectCancelButton, 800);
-        }
-        """
-
-        
-        chapter_editor_css = """
+        ''')
+
+_FONT_MONO = ('JetBrains Mono', 'monospace', 'Consolas', 'Menlo', 'Liberation Mono')
+
+@lru_cache(maxsize=1)
+def _get_theme()->gr.themes.Base:
+    # Blocks keep per-build handler state and are not cached, the theme is stateless and is
+    return gr.themes.Origin(
+        primary_hue='green',
+        secondary_hue='amber',
+        neutral_hue='gray',
+        radius_size='lg',
+        font_mono=_FONT_MONO
+    )
+
+_CHAPTER_EDITOR_CSS = _minify_css("""
     #chapter-editor-content {
         --bg-color: #0b0f19;
         --text-color: #e5e7eb;
@@ -1089,6 +964,7 @@ def build_interface(args:dict)->gr.Blocks:
         max-height: 80vh;
         box-sizing: border-box;
         padding: 20px;
+        contain: layout paint style;
     }
 
     .editor-header {
@@ -1125,6 +1001,7 @@ def build_interface(args:dict)->gr.Blocks:
         overflow-x: hidden;
         margin-bottom: 15px;
         min-height: 0;
+        contain: layout paint style;
     }
 
     #chapterTable {
@@ -1145,6 +1022,7 @@ def build_interface(args:dict)->gr.Blocks:
         position: sticky;
         top: 0;
         z-index: 1;
+        will-change: transform;
     }
 
     #chapterTable textarea {
@@ -1304,9 +1182,326 @@ def build_interface(args:dict)->gr.Blocks:
         transform: none !important;
         position: absolute !important;
     }
-    """
+    """)
+
+StaticOptions = namedtuple('StaticOptions', ['language_options', 'split_hours', 'src_label_file', 'src_label_dir'])
+
+@lru_cache(maxsize=2)
+def _get_css(performance_ui:bool=False)->str:
+    css = f'{_HEADER_CSS} {_CHAPTER_EDITOR_CSS}'
+    return f'{css} {_PERFORMANCE_CSS}' if performance_ui else css
+
+@lru_cache(maxsize=1)
+def _get_static_options()->StaticOptions:
+    return StaticOptions(_LANGUAGE_OPTIONS, _SPLIT_HOURS, 'Upload File', 'Select a Directory')
+
+# An argument-less update carries no state and gradio never mutates it, one shared instance is enough
+_NOOP_UPDATE = gr.update()
+_NOOP_UPDATES = (_NOOP_UPDATE, _NOOP_UPDATE, _NOOP_UPDATE)
+_CONVERT_BTN_ACTIVE = gr.update(variant='primary', interactive=True)
+_CONVERT_BTN_INACTIVE = gr.update(variant='primary', interactive=False)
+
+def update_gr_save_session(session, state_update):
+    return _NOOP_UPDATES
+
+_TITLE = 'Ebook2Audiobook'
+_VERSION_HTML = f'<div style="right:0;margin:auto;padding:10px;text-align:center"><a href="https://github.com/DrewThomasson/ebook2audiobook" style="text-decoration:none;font-size:14px" target="_blank"><b>{_TITLE}</b>&nbsp;<b style="color:orange; text-shadow: 0.3px 0.3px 0.3px #303030">{prog_version}</b></a></div>'
+
+# Modal markup only varies by message and mode, the static parts are built once
+_MODAL_HTML_OPEN = '<div id="custom-gr_modal" class="gr-modal"><div class="gr-modal-content"><p style="color:#ffffff; word-wrap:break-word; overflow-wrap:break-word; white-space:pre-wrap;">'
+_SPINNER_HTML = '<div class="spinner"></div>'
+_CONFIRM_BUTTONS_HTML = {
+    mode: f'<div class="confirm-buttons"><button class="button-green" onclick="document.querySelector(\'#gr_{mode}_yes_btn\').click()">✔</button><button class="button-red" onclick="document.querySelector(\'#gr_{mode}_no_btn\').click()">⨉</button></div>'
+    for mode in ('confirm_deletion', 'confirm_blocks')
+}
+
+@lru_cache(maxsize=16)
+def _yellow_stars(n:int)->str:
+    return "".join(
+        "<span style='color:#f0bc00; font-size:12px'>★</span>" for _ in range(n)
+    )
+
+@lru_cache(maxsize=16)
+def _color_box(value:int)->str:
+    if value <= 4:
+        color = "#4CAF50"  # Green = low
+    elif value <= 8:
+        color = "#FF9800"  # Orange = medium
+    else:
+        color = "#F44336"  # Red = high
+    return f"<span style='background:{color};color:white; padding: 0 3px 0 3px; border-radius:3px; font-size:11px; white-space: nowrap'>{str(value)} GB</span>"
+
+# Ratings are static per engine, the header HTML is built once per engine
+@lru_cache(maxsize=16)
+def show_rating(tts_engine:str)->str:
+    rating = default_engine_settings[tts_engine]['rating']
+    return f'<div style="display:flex; justify-content:space-between; align-items:flex-end;"><span class="gr-markdown-span">TTS Engine</span><table style="display:inline-block; border-collapse:collapse; border:none; margin:0; padding:0; font-size:12px; line-height:1.2;"><tr style="border:none; vertical-align:bottom;"><td style="padding:0 5px 0 2.5px; border:none; vertical-align:bottom;"><b>VRAM:</b> {_color_box(int(rating["VRAM"]))}</td><td style="padding:0 5px 0 2.5px; border:none; vertical-align:bottom;"><b>CPU:</b> {_yellow_stars(int(rating["CPU"]))}</td><td style="padding:0 5px 0 2.5px; border:none; vertical-align:bottom;"><b>RAM:</b> {_color_box(int(rating["RAM"]))}</td><td style="padding:0 5px 0 2.5px; border:none; vertical-align:bottom;"><b>Realism:</b> {_yellow_stars(int(rating["Realism"]))}</td></tr></table></div>'
+
+@lru_cache(maxsize=1)
+def _get_translation_choices()->tuple:
+    # langdetect/deep_translator are only needed once the chapter editor is built
+    from lib.classes.translator import get_translation_languages
+    return (("No Translation (Keep Original)", ""),) + tuple(get_translation_languages())
+
+@lru_cache(maxsize=32)
+def _get_translation_overlay_html(detected_lang: str = 'en') -> str:
+    """Generate HTML for the translation overlay modal, built once per detected language"""
+    from lib.classes.translator import SUPPORTED_LANGUAGES
+    lang_options = ''.join([
+        f'<option value="{code}">{name}</option>'
+        for code, name in sorted(SUPPORTED_LANGUAGES.items(), key=lambda x: x[1])
+    ])
+    detected_name = SUPPORTED_LANGUAGES.get(detected_lang, 'Unknown')
+    return f'''
+    <div id="translation_backdrop" class="translation-overlay-backdrop" onclick="window.closeTranslationOverlay()"></div>
+    <div class="translation-overlay-content">
+        <div class="translation-overlay-header">
+            <h3 class="translation-overlay-title">🌐 Translate Document</h3>
+            <button class="translation-overlay-close" onclick="window.closeTranslationOverlay()">×</button>
+        </div>
+        <div class="translation-form-group">
+            <label class="translation-form-label">Detected Language</label>
+            <div class="translation-detected-lang">
+                {detected_name} ({detected_lang})
+            </div>
+        </div>
+        <div class="translation-form-group">
+            <label class="translation-form-label">Translate To</label>
+            <select id="translation_target_lang" class="translation-form-select">
+                {lang_options}
+            </select>
+        </div>
+        <div class="translation-form-group">
+            <label class="translation-form-label">Translation Service</label>
+            <select id="translation_service" class="translation-form-select">
+                <option value="google">Google Translate (Online)</option>
+                <option value="argos">Argos Translate (Offline)</option>
+                <!-- <option value="mymemory">MyMemory</option> -->
+            </select>
+        </div>
+        <div id="translation_progress" class="translation-progress" style="display: none;">
+            <span id="translation_status">Translating...</span>
+            <div class="translation-progress-bar">
+                <div id="translation_progress_fill" class="translation-progress-fill" style="width: 0%"></div>
+            </div>
+        </div>
+        <div class="translation-btn-row">
+            <button class="translation-btn translation-btn-secondary" onclick="window.closeTranslationOverlay()">Cancel</button>
+            <button id="start_translation_btn" class="translation-btn translation-btn-primary" onclick="window.startTranslation()">Translate</button>
+        </div>
+    </div>
+    '''
+
+# JavaScript for translation overlay (passed via js parameter)
+_HEADER_JS = """
+function() {
+    // Global translation overlay functions
+    window.closeTranslationOverlay = function() {
+        console.log('closeTranslationOverlay called');
+        var overlay = document.getElementById('gr_translation_overlay');
+        if (overlay) {
+            overlay.style.display = 'none';
+            console.log('Overlay hidden');
+        }
+    };
+    
+    window.startTranslation = function() {
+        console.log('startTranslation called');
+        // Ignore double clicks and retries while the previous request is being dispatched
+        if (window._translationInFlight) {
+            console.log('Translation already requested');
+            return;
+        }
+        var targetLang = document.getElementById('translation_target_lang');
+        var service = document.getElementById('translation_service');
+        
+        if (!targetLang || !service) {
+            console.log('Translation inputs not found');
+            return;
+        }
+        
+        window._translationInFlight = true;
+        setTimeout(function() { window._translationInFlight = false; }, 2000);
+        
+        var targetLangValue = targetLang.value;
+        var serviceValue = service.value;
+        console.log('Target:', targetLangValue, 'Service:', serviceValue);
+        
+        // Show progress
+        var progressEl = document.getElementById('translation_progress');
+        var statusEl = document.getElementById('translation_status');
+        var startBtn = document.getElementById('start_translation_btn');
+        
+        if (progressEl) progressEl.style.display = 'block';
+        if (statusEl) statusEl.textContent = 'Starting translation...';
+        if (startBtn) startBtn.disabled = true;
+        
+        // Set hidden Gradio component values - service change triggers the translation
+        var bridge = window._translationBridge;
+        if (!bridge || !bridge.target || !bridge.target.isConnected || !bridge.service || !bridge.service.isConnected) {
+            bridge = window._translationBridge = {
+                target: document.querySelector('#gr_translation_target_lang input, #gr_translation_target_lang textarea'),
+                service: document.querySelector('#gr_translation_service input, #gr_translation_service textarea')
+            };
+        }
+        var targetInput = bridge.target;
+        var serviceInput = bridge.service;
+        
+        console.log('targetInput:', targetInput, 'serviceInput:', serviceInput);
+        
+        // First set target lang (this won't trigger anything)
+        if (targetInput) {
+            targetInput.value = targetLangValue;
+            targetInput.dispatchEvent(new Event('input', {bubbles: true}));
+            console.log('Set target lang:', targetLangValue);
+        }
+        
+        // Close overlay after a short delay
+        setTimeout(function() {
+            window.closeTranslationOverlay();
+            
+            // Then set service (this WILL trigger the translation via .change() handler),
+            // one frame later so the closed overlay is painted before Python is invoked
+            requestAnimationFrame(function() {
+                if (serviceInput) {
+                    // Append timestamp to make it unique, the 'input' event alone updates the bound
+                    // value and gradio fires .change() from that, a DOM 'change' would only repeat it
+                    serviceInput.value = serviceValue + '_' + Date.now();
+                    serviceInput.dispatchEvent(new Event('input', {bubbles: true}));
+                    console.log('Set service with trigger:', serviceValue);
+                }
+            });
+        }, 200);
+    };
+    
+    console.log('Translation functions registered');
     
-        with gr.Blocks(theme=theme, title=title, css=header_css + chapter_editor_css, js=header_js, delete_cache=(604800, 86400)) as app:
+    // Inject Cancel Job Button into Settings
+    // Last successful insertion target, reused while gradio keeps it attached to the page
+    var cachedSection = null;
+    var cancelLabel = '\\u{1F6D1} Cancel Current Job';
+    // Let the browser's XPath engine do the text match instead of walking every node in JS
+    var findFirst = function(xpath) {
+        return document.evaluate(xpath, document.body, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    };
+    window.injectCancelButton = function() {
+        if (document.getElementById('injected_cancel_job_btn')) return;
+        var section = (cachedSection && cachedSection.isConnected) ? cachedSection : null;
+        var screenStudioAnchor = null;
+        
+        // Strategy 1: Look for "Screen Studio" text (loose match for BETA badge),
+        // prioritize headers or short span/div labels to avoid description text
+        if (!section) {
+            screenStudioAnchor = findFirst("//*[self::h2 or self::h3 or self::h4 or self::span or self::div][contains(., 'Screen Studio') and ((not(self::span) and not(self::div)) or string-length(.) < 40)]");
+        }
+        
+        // Strategy 2: Fallback to "Start Recording" button if header not found
+        if (!section && !screenStudioAnchor) {
+            screenStudioAnchor = findFirst("//button[contains(., 'Start Recording')]");
+        }
+
+        if (!section && screenStudioAnchor) {
+            // Try to find the section container
+            section = screenStudioAnchor.closest('div.setting, section, .settings-section');
+            if (!section) section = screenStudioAnchor.parentElement; 
+            if (!section) section = screenStudioAnchor; // Last resort
+        }
+
+        if (section) {
+            if (!document.getElementById('injected_cancel_job_btn')) {
+                console.log('Found Screen Studio section, injecting Cancel button');
+                // Look and hover state come from the .injected-cancel-* rules in the page CSS
+                var btnContainer = document.createElement('div');
+                btnContainer.className = 'injected-cancel-container';
+                
+                var btn = document.createElement('button');
+                btn.id = 'injected_cancel_job_btn';
+                btn.className = 'injected-cancel-btn';
+                btn.textContent = cancelLabel;
+                
+                btn.addEventListener('click', function() {
+                    var hiddenBtn = document.getElementById('gr_cancel_job_btn');
+                    if (hiddenBtn) {
+                        hiddenBtn.click();
+                        btn.textContent = '\\u23F3 Requesting Cancellation...';
+                        btn.disabled = true;
+                        setTimeout(function() { 
+                            btn.textContent = cancelLabel;
+                            btn.disabled = false;
+                        }, 3000);
+                    } else {
+                        console.error('Hidden cancel button not found');
+                    }
+                });
+                
+                btnContainer.appendChild(btn);
+                
+                // Insert AFTER the section container to appear "underneath"
+                if (section.parentNode) {
+                    cachedSection = section;
+                     if (section.nextSibling) {
+                        section.parentNode.insertBefore(btnContainer, section.nextSibling);
+                    } else {
+                        section.parentNode.appendChild(btnContainer);
+                    }
+                }
+            }
+        }
+    };
+    
+    // Run fn from leftover frame time so the scan never competes with user input
+    var runWhenIdle = function(fn) {
+        if (window.requestIdleCallback) {
+            window.requestIdleCallback(fn, {timeout: 1000});
+        } else {
+            setTimeout(fn, 0);
+        }
+    };
+    
+    // Coalesce calls until the DOM settles, then run when the browser is idle
+    var debounce = function(fn, wait) {
+        var timer = null;
+        return function() {
+            clearTimeout(timer);
+            timer = setTimeout(function() { runWhenIdle(fn); }, wait);
+        };
+    };
+    
+    // Run injection check only when the DOM changes
+    var injectObserver = new MutationObserver(debounce(window.injectCancelButton, 200));
+    injectObserver.observe(document.body, {childList: true, subtree: true});
+    runWhenIdle(window.injectCancelButton);
+}
+"""
+
+def build_interface(args:dict)->gr.Blocks:
+    try:
+        script_mode = args['script_mode']
+        is_gui_process = args['is_gui_process']
+        is_gui_shared = args['share']
+        title = _TITLE
+        gr_glassmask_msg = 'Initialization, please wait...'
+        voice_options = []
+        tts_engine_options = []
+        custom_model_options = []
+        fine_tuned_options = []
+        audiobook_options = []
+        language_options, options_output_split_hours, src_label_file, src_label_dir = _get_static_options()
+        
+        component_options = interface_component_options
+        visible_gr_tab_xtts_params = component_options['gr_tab_xtts_params']
+        visible_gr_tab_bark_params = component_options['gr_tab_bark_params']
+        visible_gr_tab_supertonic_params = component_options['gr_tab_supertonic_params']
+        visible_gr_group_custom_model = component_options['gr_group_custom_model']
+        visible_gr_group_voice_file = component_options['gr_group_voice_file']
+        xtts_settings = default_engine_settings[TTS_ENGINES['XTTSv2']]
+        bark_settings = default_engine_settings[TTS_ENGINES['BARK']]
+        supertonic_settings = default_engine_settings[TTS_ENGINES['SUPERTONIC']]
+
+        theme = _get_theme()
+        performance_ui = component_options.get('gr_group_performance', False)
+
+        with gr.Blocks(theme=theme, title=title, css=_get_css(performance_ui), js=_HEADER_JS, delete_cache=(604800, 86400)) as app:
             with gr.Group(visible=True, elem_id='gr_group_main', elem_classes='gr-group-main') as gr_group_main:
                 with gr.Tabs(elem_id='gr_tabs'):
                     gr_tab_main = gr.Tab('Dashboard', elem_id='gr_tab_main', elem_classes='gr-tab')
@@ -1391,7 +1586,7 @@ def build_interface(args:dict)->gr.Blocks:
                                 minimum=0.05,
                                 maximum=10.0,
                                 step=0.05,
-                                value=float(default_engine_settings[TTS_ENGINES['XTTSv2']]['temperature']),
+                                value=float(xtts_settings['temperature']),
                                 elem_id='gr_xtts_temperature',
                                 info='Higher values lead to more creative, unpredictable outputs. Lower values make it more monotone.'
                             )
@@ -1400,7 +1595,7 @@ def build_interface(args:dict)->gr.Blocks:
                                 minimum=0.3,
                                 maximum=5.0,
                                 step=0.1,
-                                value=float(default_engine_settings[TTS_ENGINES['XTTSv2']]['length_penalty']),
+                                value=float(xtts_settings['length_penalty']),
                                 elem_id='gr_xtts_length_penalty',
                                 info='Adjusts how much longer sequences are preferred. Higher values encourage the model to produce longer and more natural speech.',
                                 visible=False
@@ -1410,7 +1605,7 @@ def build_interface(args:dict)->gr.Blocks:
                                 minimum=1,
                                 maximum=10,
                                 step=1,
-                                value=int(default_engine_settings[TTS_ENGINES['XTTSv2']]['num_beams']),
+                                value=int(xtts_settings['num_beams']),
                                 elem_id='gr_xtts_num_beams',
                                 info='Controls how many alternative sequences the model explores. Higher values improve speech coherence and pronunciation but increase inference time.',
                                 visible=False
@@ -1420,7 +1615,7 @@ def build_interface(args:dict)->gr.Blocks:
                                 minimum=1.0,
                                 maximum=10.0,
                                 step=0.1,
-                                value=float(default_engine_settings[TTS_ENGINES['XTTSv2']]['repetition_penalty']),
+                                value=float(xtts_settings['repetition_penalty']),
                                 elem_id='gr_xtts_repetition_penalty',
                                 info='Penalizes repeated phrases. Higher values reduce repetition.'
                             )
@@ -1429,7 +1624,7 @@ def build_interface(args:dict)->gr.Blocks:
                                 minimum=10,
                                 maximum=100,
                                 step=1,
-                                value=int(default_engine_settings[TTS_ENGINES['XTTSv2']]['top_k']),
+                                value=int(xtts_settings['top_k']),
                                 elem_id='gr_xtts_top_k',
                                 info='Lower values restrict outputs to more likely words and increase speed at which audio generates.'
                             )
@@ -1438,7 +1633,7 @@ def build_interface(args:dict)->gr.Blocks:
                                 minimum=0.1,
                                 maximum=1.0, 
                                 step=0.01,
-                                value=float(default_engine_settings[TTS_ENGINES['XTTSv2']]['top_p']),
+                                value=float(xtts_settings['top_p']),
                                 elem_id='gr_xtts_top_p',
                                 info='Controls cumulative probability for word selection. Lower values make the output more predictable and increase speed at which audio generates.'
                             )
@@ -1447,13 +1642,13 @@ def build_interface(args:dict)->gr.Blocks:
                                 minimum=0.5, 
                                 maximum=3.0, 
                                 step=0.1, 
-                                value=float(default_engine_settings[TTS_ENGINES['XTTSv2']]['speed']),
+                                value=float(xtts_settings['speed']),
                                 elem_id='gr_xtts_speed',
                                 info='Adjusts how fast the narrator will speak.'
                             )
                             gr_xtts_enable_text_splitting = gr.Checkbox(
                                 label='Enable Text Splitting', 
-                                value=default_engine_settings[TTS_ENGINES['XTTSv2']]['enable_text_splitting'],
+                                value=xtts_settings['enable_text_splitting'],
                                 elem_id='gr_xtts_enable_text_splitting',
                                 info='Coqui-tts builtin text splitting. Can help against hallucinations bu can also be worse.',
                                 visible=False
@@ -1470,7 +1665,7 @@ def build_interface(args:dict)->gr.Blocks:
                                 minimum=0.0,
                                 maximum=1.0,
                                 step=0.01,
-                                value=float(default_engine_settings[TTS_ENGINES['BARK']]['text_temp']),
+                                value=float(bark_settings['text_temp']),
                                 elem_id='gr_bark_text_temp',
                                 info='Higher values lead to more creative, unpredictable outputs. Lower values make it more conservative.'
                             )
@@ -1479,12 +1674,12 @@ def build_interface(args:dict)->gr.Blocks:
                                 minimum=0.0,
                                 maximum=1.0,
                                 step=0.01,
-                                value=float(default_engine_settings[TTS_ENGINES['BARK']]['waveform_temp']),
+                                value=float(bark_settings['waveform_temp']),
                                 elem_id='gr_bark_waveform_temp',
                                 info='Higher values lead to more creative, unpredictable outputs. Lower values make it more conservative.'
                             )
 
-                    gr_tab_supertonic_params = gr.Tab('Supertonic Settings', elem_id='gr_tab_supertonic_params', elem_classes='gr-tab', visible=interface_component_options['gr_tab_supertonic_params'])
+                    gr_tab_supertonic_params = gr.Tab('Supertonic Settings', elem_id='gr_tab_supertonic_params', elem_classes='gr-tab', visible=visible_gr_tab_supertonic_params)
                     with gr_tab_supertonic_params:
                         gr.Markdown(
                             elem_id='gr_markdown_tab_supertonic_params',
@@ -1496,7 +1691,7 @@ def build_interface(args:dict)->gr.Blocks:
                                 minimum=0.1,
                                 maximum=3.0,
                                 step=0.1,
-                                value=float(default_engine_settings[TTS_ENGINES['SUPERTONIC']]['speed']),
+                                value=float(supertonic_settings['speed']),
                                 elem_id='gr_supertonic_speed',
                                 info='Adjusts how fast the narrator will speak.'
                             )
@@ -1505,7 +1700,7 @@ def build_interface(args:dict)->gr.Blocks:
                                 minimum=1,
                                 maximum=100,
                                 step=1,
-                                value=int(default_engine_settings[TTS_ENGINES['SUPERTONIC']]['total_step']),
+                                value=int(supertonic_settings['total_step']),
                                 elem_id='gr_supertonic_total_step',
                                 info='Higher values improve quality but increase generation time. 10 is recommended for normal speech.'
                             )
@@ -1531,7 +1726,7 @@ def build_interface(args:dict)->gr.Blocks:
                         gr_convert_btn = gr.Button(elem_id='gr_convert_btn', value='Convert 📚', elem_classes='gr-convert-btn', variant='primary', interactive=False, scale=2)
                         gr_main_cancel_btn = gr.Button(elem_id='gr_main_cancel_btn', value='Cancel Job 🛑', variant='secondary', scale=1)
 
-            gr_version_markdown = gr.Markdown(elem_id='gr_version_markdown', value=f'<div style="right:0;margin:auto;padding:10px;text-align:center"><a href="https://github.com/DrewThomasson/ebook2audiobook" style="text-decoration:none;font-size:14px" target="_blank"><b>{title}</b>&nbsp;<b style="color:orange; text-shadow: 0.3px 0.3px 0.3px #303030">{prog_version}</b></a></div>')
+            gr_version_markdown = gr.Markdown(elem_id='gr_version_markdown', value=_VERSION_HTML)
 
             # Chapter Editor Modal - Native Gradio Components
             with gr.Group(visible=False, elem_id="gr_chapter_editor_group") as gr_chapter_editor_group:
@@ -1567,7 +1762,7 @@ def build_interface(args:dict)->gr.Blocks:
                     gr_chapter_trans_lang = gr.Dropdown(
                         label=None,
                         show_label=False, 
-                        choices=[("No Translation (Keep Original)", "")] + get_translation_languages(),
+                        choices=_get_translation_choices(),
                         value="",
                         interactive=True,
                         elem_id="gr_chapter_trans_lang",
@@ -1596,52 +1791,29 @@ def build_interface(args:dict)->gr.Blocks:
             gr_save_session = gr.JSON(elem_id='gr_save_session', visible='hidden') 
 
             def disable_components()->tuple:
-                outputs = tuple([gr.update(interactive=False) for _ in range(12)])
+                outputs = (gr.update(interactive=False),) * 12
                 return outputs
             
             def enable_components(id:str)->tuple:
                 session = context.get_session(id)
                 if session['event'] == 'confirm_blocks':
-                    outputs = tuple([gr.update() for _ in range(12)])
+                    outputs = (_NOOP_UPDATE,) * 12
                 else:
-                    outputs = tuple([gr.update(interactive=True) for _ in range(12)])
+                    outputs = (gr.update(interactive=True),) * 12
                 return outputs
 
             def show_gr_modal(type:str, msg:str)->str:
-                return f'<div id="custom-gr_modal" class="gr-modal"><div class="gr-modal-content"><p style="color:#ffffff; word-wrap:break-word; overflow-wrap:break-word; white-space:pre-wrap;">{msg[:70]}...</p>{show_confirm_buttons(type)}</div></div>'
+                return f'{_MODAL_HTML_OPEN}{msg[:70]}...</p>{show_confirm_buttons(type)}</div></div>'
 
             def show_confirm_buttons(mode:str)->str:
-                if mode in ['confirm_deletion', 'confirm_blocks']:
-                    button_yes = f'#gr_{mode}_yes_btn'
-                    button_no = f'#gr_{mode}_no_btn'
-                    return f'<div class="confirm-buttons"><button class="button-green" onclick="document.querySelector(\'{button_yes}\').click()">✔</button><button class="button-red" onclick="document.querySelector(\'{button_no}\').click()">⨉</button></div>'
-                else:
-                    return '<div class="spinner"></div>'
-
-            def show_rating(tts_engine:str)->str:
-                def yellow_stars(n:int):
-                    return "".join(
-                        "<span style='color:#f0bc00; font-size:12px'>★</span>" for _ in range(n)
-                    )
-
-                def color_box(value:int)->str:
-                    if value <= 4:
-                        color = "#4CAF50"  # Green = low
-                    elif value <= 8:
-                        color = "#FF9800"  # Orange = medium
-                    else:
-                        color = "#F44336"  # Red = high
-                    return f"<span style='background:{color};color:white; padding: 0 3px 0 3px; border-radius:3px; font-size:11px; white-space: nowrap'>{str(value)} GB</span>"
-                
-                rating = default_engine_settings[tts_engine]['rating']
-                return f'<div style="display:flex; justify-content:space-between; align-items:flex-end;"><span class="gr-markdown-span">TTS Engine</span><table style="display:inline-block; border-collapse:collapse; border:none; margin:0; padding:0; font-size:12px; line-height:1.2;"><tr style="border:none; vertical-align:bottom;"><td style="padding:0 5px 0 2.5px; border:none; vertical-align:bottom;"><b>VRAM:</b> {color_box(int(rating["VRAM"]))}</td><td style="padding:0 5px 0 2.5px; border:none; vertical-align:bottom;"><b>CPU:</b> {yellow_stars(int(rating["CPU"]))}</td><td style="padding:0 5px 0 2.5px; border:none; vertical-align:bottom;"><b>RAM:</b> {color_box(int(rating["RAM"]))}</td><td style="padding:0 5px 0 2.5px; border:none; vertical-align:bottom;"><b>Realism:</b> {yellow_stars(int(rating["Realism"]))}</td></tr></table></div>'
+                return _CONFIRM_BUTTONS_HTML.get(mode, _SPINNER_HTML)
 
             def restore_interface(id:str, req:gr.Request)->tuple:
                 try:
                     session = context.get_session(id)
                     socket_hash = str(req.session_hash)
                     if not session.get(socket_hash):
-                        outputs = tuple([gr.update() for _ in range(15)])
+                        outputs = (_NOOP_UPDATE,) * 15
                         return outputs
                     ebook_data = None
                     file_count = session['ebook_mode']
@@ -1659,10 +1831,8 @@ def build_interface(args:dict)->gr.Blocks:
                     else:
                         ebook_data = session['ebook'] = None
                     if ebook_data is not None:
-                        current_dir_cache = tempfile.gettempdir()
-                        current_dir_cache_norm = os.path.normpath(current_dir_cache)
                         prev_cache_dir = os.path.normpath(os.path.dirname(ebook_data[0]) if isinstance(ebook_data, list) else os.path.dirname(ebook_data))
-                        if prev_cache_dir != current_dir_cache_norm:
+                        if prev_cache_dir != _TMP_DIR_NORM:
                             ebook_data = None
                         session['ebook'] = ebook_data
                     visible_row_split_hours = True if session['output_split'] else False
@@ -1686,7 +1856,7 @@ def build_interface(args:dict)->gr.Blocks:
                 except Exception as e:
                     error = f'restore_interface(): {e}'
                     alert_exception(error, id)
-                    outputs = tuple([gr.update() for _ in range(15)])
+                    outputs = (_NOOP_UPDATE,) * 15
                     return outputs
 
             def restore_audiobook_player(audiobook:str|None)->tuple:
@@ -1696,13 +1866,13 @@ def build_interface(args:dict)->gr.Blocks:
                 except Exception as e:
                     error = f'restore_audiobook_player(): {e}'
                     alert_exception(error, None)
-                    outputs = tuple([gr.update() for _ in range(3)])
+                    outputs = (_NOOP_UPDATE,) * 3
                     return outputs
 
             def refresh_interface(id:str)->tuple:
                 session = context.get_session(id)
                 if session['event'] == 'confirm_blocks':
-                    outputs = tuple([gr.update() for _ in range(9)])
+                    outputs = (_NOOP_UPDATE,) * 9
                     return outputs
                 else:
                     return (
@@ -1753,29 +1923,36 @@ def build_interface(args:dict)->gr.Blocks:
 
             def change_convert_btn(upload_file:str|None=None, upload_file_mode:str|None=None, custom_model_file:str|None=None, session:DictProxy=None)->dict:
                 try:
-                    if session is None:
-                        return gr.update(variant='primary', interactive=False)
-                    else:
-                        if hasattr(upload_file, 'name') and not hasattr(custom_model_file, 'name'):
-                            return gr.update(variant='primary', interactive=True)
-                        elif isinstance(upload_file, list) and len(upload_file) > 0 and upload_file_mode == 'directory' and not hasattr(custom_model_file, 'name'):
-                            return gr.update(variant='primary', interactive=True)
-                        else:
-                            return gr.update(variant='primary', interactive=False)
+                    if session is None or hasattr(custom_model_file, 'name'):
+                        return _CONVERT_BTN_INACTIVE
+                    has_ebook = hasattr(upload_file, 'name') or (isinstance(upload_file, list) and len(upload_file) > 0 and upload_file_mode == 'directory')
+                    return _CONVERT_BTN_ACTIVE if has_ebook else _CONVERT_BTN_INACTIVE
                 except Exception as e:
                     error = f'change_convert_btn(): {e}'
                     alert_exception(error, None)
                     return gr.update()
 
+            def preview_chapters(file_path:str, id:str, session:DictProxy, prev_chapters:Any, max_chars:int, progress:gr.Progress)->Any:
+                # gradio re-emits .change for the same upload, skip the parse when file and settings did not change
+                try:
+                    preview_key = [file_path, os.path.getmtime(file_path), max_chars, bool(session.get('force_ocr'))]
+                except OSError:
+                    preview_key = None
+                if preview_key is not None and prev_chapters is not None and session.get('preview_key') == preview_key:
+                    session['chapters'] = prev_chapters
+                    return prev_chapters
+                result = extract_preview_chapters(file_path, id, max_chars, progress=progress)
+                session['preview_key'] = preview_key
+                return result
+
             def change_gr_ebook_file(data:str|None, id:str, progress=gr.Progress())->tuple:
                 try:
-                    print(f"DEBUG change_gr_ebook_file: data type={type(data)}, data={data}")
                     session = context.get_session(id)
+                    prev_chapters = session.get("chapters")
                     session["ebook"] = None
                     session["ebook_list"] = None
                     session["chapters"] = None  # Reset chapters when file changes
                     if data is None:
-                        print("DEBUG: data is None")
                         if session.get("status") == "converting":
                             session["cancellation_requested"] = True
                             msg = "Cancellation requested, please wait..."
@@ -1784,10 +1961,8 @@ def build_interface(args:dict)->gr.Blocks:
                     # Get max_chars from current TTS engine settings
                     tts_engine = session.get('tts_engine', default_tts_engine)
                     max_chars = default_engine_settings.get(tts_engine, {}).get('max_chars', 250)
-                    print(f"DEBUG: Using max_chars={max_chars} for TTS engine {tts_engine}")
                     
                     if isinstance(data, list):
-                        print(f"DEBUG: data is list with {len(data)} items")
                         ebook_list = []
                         for f in data:
                             path = f.get("path") if isinstance(f, dict) else str(f)
@@ -1795,9 +1970,7 @@ def build_interface(args:dict)->gr.Blocks:
                         session["ebook_list"] = ebook_list
                         # Extract preview from first file in list
                         if ebook_list:
-                            print(f"DEBUG: Calling extract_preview_chapters with {ebook_list[0]}")
-                            result = extract_preview_chapters(ebook_list[0], id, max_chars, progress=progress)
-                            print(f"DEBUG: extract_preview_chapters returned: {result is not None}, chapters in session: {session.get('chapters') is not None}")
+                            preview_chapters(ebook_list[0], id, session, prev_chapters, max_chars, progress)
                     else:
                         # Data could be a file path string or a Gradio FileData object
                         file_path = data
@@ -1805,20 +1978,17 @@ def build_interface(args:dict)->gr.Blocks:
                             file_path = data.name
                         elif isinstance(data, dict) and 'path' in data:
                             file_path = data['path']
-                        print(f"DEBUG: file_path={file_path}")
                         session["ebook"] = file_path
                         # Extract preview chapters for the Chapter Editor
                         if file_path:
-                            print(f"DEBUG: Calling extract_preview_chapters with {file_path}")
-                            result = extract_preview_chapters(file_path, id, max_chars, progress=progress)
-                            print(f"DEBUG: extract_preview_chapters returned: {result is not None}, chapters in session: {session.get('chapters') is not None}")
+                            preview_chapters(file_path, id, session, prev_chapters, max_chars, progress)
                     session["cancellation_requested"] = False
                     return gr.update(value='', visible=False)
 
 
                 except Exception as e:
                     error = f'change_gr_ebook_file(): {e}'
-                    print(f"DEBUG ERROR: {error}")
+                    print(error)
                     import traceback
                     traceback.print_exc()
                     alert_exception(error, id)
@@ -1826,19 +1996,16 @@ def build_interface(args:dict)->gr.Blocks:
 
             def reprocess_ebook(id:str, progress=gr.Progress())->tuple:
                 try:
-                    print(f"DEBUG reprocess_ebook called for session {id}")
                     session = context.get_session(id)
                     file_path = session.get("ebook")
                     
                     if not file_path or not os.path.exists(file_path):
-                         print("DEBUG: No ebook file in session to reprocess")
                          return gr.update()
                     
                     # Get max_chars from current TTS engine settings
                     tts_engine = session.get('tts_engine', default_tts_engine)
                     max_chars = default_engine_settings.get(tts_engine, {}).get('max_chars', 250)
                     
-                    print(f"DEBUG: Reprocessing {file_path} with Force OCR={session.get('force_ocr')}")
                     extract_preview_chapters(file_path, id, max_chars, progress=progress)
                     
                     return gr.update(), gr.update(value='', visible=False)
@@ -2115,54 +2282,6 @@ def build_interface(args:dict)->gr.Blocks:
                     return gr.update()
 
             # Translation functions
-            def get_translation_overlay_html(detected_lang: str = 'en') -> str:
-                """Generate HTML for the translation overlay modal"""
-                from lib.classes.translator import SUPPORTED_LANGUAGES
-                lang_options = ''.join([
-                    f'<option value="{code}">{name}</option>'
-                    for code, name in sorted(SUPPORTED_LANGUAGES.items(), key=lambda x: x[1])
-                ])
-                detected_name = SUPPORTED_LANGUAGES.get(detected_lang, 'Unknown')
-                return f'''
-                <div id="translation_backdrop" class="translation-overlay-backdrop" onclick="window.closeTranslationOverlay()"></div>
-                <div class="translation-overlay-content">
-                    <div class="translation-overlay-header">
-                        <h3 class="translation-overlay-title">🌐 Translate Document</h3>
-                        <button class="translation-overlay-close" onclick="window.closeTranslationOverlay()">×</button>
-                    </div>
-                    <div class="translation-form-group">
-                        <label class="translation-form-label">Detected Language</label>
-                        <div class="translation-detected-lang">
-                            {detected_name} ({detected_lang})
-                        </div>
-                    </div>
-                    <div class="translation-form-group">
-                        <label class="translation-form-label">Translate To</label>
-                        <select id="translation_target_lang" class="translation-form-select">
-                            {lang_options}
-                        </select>
-                    </div>
-                    <div class="translation-form-group">
-                        <label class="translation-form-label">Translation Service</label>
-                        <select id="translation_service" class="translation-form-select">
-                            <option value="google">Google Translate (Online)</option>
-                            <option value="argos">Argos Translate (Offline)</option>
-                            <!-- <option value="mymemory">MyMemory</option> -->
-                        </select>
-                    </div>
-                    <div id="translation_progress" class="translation-progress" style="display: none;">
-                        <span id="translation_status">Translating...</span>
-                        <div class="translation-progress-bar">
-                            <div id="translation_progress_fill" class="translation-progress-fill" style="width: 0%"></div>
-                        </div>
-                    </div>
-                    <div class="translation-btn-row">
-                        <button class="translation-btn translation-btn-secondary" onclick="window.closeTranslationOverlay()">Cancel</button>
-                        <button id="start_translation_btn" class="translation-btn translation-btn-primary" onclick="window.startTranslation()">Translate</button>
-                    </div>
-                </div>
-                '''
-
             def show_translation_overlay(id: str) -> tuple:
                 """Show the translation overlay with detected language"""
                 try:
@@ -2195,7 +2314,7 @@ def build_interface(args:dict)->gr.Blocks:
                     else:
                         print(f"No ebook path found in session. session['ebook'] = {ebook_path}")
                     
-                    overlay_html = get_translation_overlay_html(detected_lang)
+                    overlay_html = _get_translation_overlay_html(detected_lang)
                     return gr.update(value=overlay_html, visible=True)
                 except Exception as e:
                     print(f"show_translation_overlay error: {e}")
@@ -2310,7 +2429,7 @@ def build_interface(args:dict)->gr.Blocks:
                 if f is not None:
                     state = {}
                     if len(custom_model_options) > max_custom_model:
-                        error = f'You are allowed to upload a max of {max_custom_models} models'   
+                        error = f'You are allowed to upload a max of {max_custom_model} models'   
                         state['type'] = 'warning'
                         state['msg'] = error
                     else:
@@ -2364,7 +2483,7 @@ def build_interface(args:dict)->gr.Blocks:
                     if session['tts_engine'] == TTS_ENGINES['BARK']:
                         bark_visible = visible_gr_tab_bark_params
                     elif session['tts_engine'] == TTS_ENGINES['SUPERTONIC']:
-                        supertonic_visible = interface_component_options['gr_tab_supertonic_params']
+                        supertonic_visible = visible_gr_tab_supertonic_params
                     return (
                         gr.update(value=show_rating(session['tts_engine'])),
                         gr.update(visible=False),
@@ -2744,7 +2863,7 @@ def build_interface(args:dict)->gr.Blocks:
                                             update_gr_audiobook_list(id),
                                         )
                                     else:
-                                        yield gr.update(), gr.update(), gr.update()
+                                        yield _NOOP_UPDATES
                                 except NameError:
                                     new_hash = hash_proxy_dict(MappingProxyType(session))
                                     state["hash"] = new_hash
@@ -2759,7 +2878,7 @@ def build_interface(args:dict)->gr.Blocks:
                             else:
                                 new_hash = hash_proxy_dict(MappingProxyType(session))
                                 if previous_hash == new_hash:
-                                    yield gr.update(), gr.update(), gr.update()
+                                    yield _NOOP_UPDATES
                                 else:
                                     state["hash"] = new_hash
                                     session_dict = json.dumps(session, cls=JSONDictProxyEncoder)
@@ -2768,7 +2887,7 @@ def build_interface(args:dict)->gr.Blocks:
                                         gr.update(value=state),
                                         gr.update(),
                                     )
-                    yield gr.update(), gr.update(), gr.update()
+                    yield _NOOP_UPDATES
                 except Exception as e:
                     error = f'update_gr_save_session(): {e}!'
                     alert_exception(error, id)
@@ -2944,46 +3063,63 @@ def build_interface(args:dict)->gr.Blocks:
                 outputs=[gr_confirm_deletion_field_hidden, gr_modal]
             )
             ########### XTTSv2 Params
+            # Engine sliders only commit the settled value, .change would save every tick of a drag
             gr_tab_xtts_params.select(
                 fn=None,
                 inputs=None,
                 outputs=None,
                 js='()=>{if(!window._xtts_sliders_initialized){const checkXttsExist=setInterval(()=>{const slider=document.querySelector("#gr_xtts_speed input[type=range]");if(slider){clearInterval(checkXttsExist);window._xtts_sliders_initialized=true;init_xtts_sliders();}},500);}}'
             )
-            gr_xtts_temperature.change(
+            # release only covers pointerup and number box blur, input catches arrow keys on the range,
+            # always_last collapses the input bursts of a drag into one pending save
+            gr.on(
+                triggers=[gr_xtts_temperature.release, gr_xtts_temperature.input],
                 fn=lambda val, id: change_param('xtts_temperature', float(val), id),
                 inputs=[gr_xtts_temperature, gr_session],
-                outputs=None
+                outputs=None,
+                trigger_mode='always_last'
             )
-            gr_xtts_length_penalty.change(
+            gr.on(
+                triggers=[gr_xtts_length_penalty.release, gr_xtts_length_penalty.input],
                 fn=lambda val, id, val2: change_param('xtts_length_penalty', int(val), id, int(val2)),
                 inputs=[gr_xtts_length_penalty, gr_session, gr_xtts_num_beams],
                 outputs=None,
+                trigger_mode='always_last'
             )
-            gr_xtts_num_beams.change(
+            gr.on(
+                triggers=[gr_xtts_num_beams.release, gr_xtts_num_beams.input],
                 fn=lambda val, id, val2: change_param('xtts_num_beams', int(val), id, int(val2)),
                 inputs=[gr_xtts_num_beams, gr_session, gr_xtts_length_penalty],
                 outputs=None,
+                trigger_mode='always_last'
             )
-            gr_xtts_repetition_penalty.change(
+            gr.on(
+                triggers=[gr_xtts_repetition_penalty.release, gr_xtts_repetition_penalty.input],
                 fn=lambda val, id: change_param('xtts_repetition_penalty', float(val), id),
                 inputs=[gr_xtts_repetition_penalty, gr_session],
-                outputs=None
+                outputs=None,
+                trigger_mode='always_last'
             )
-            gr_xtts_top_k.change(
+            gr.on(
+                triggers=[gr_xtts_top_k.release, gr_xtts_top_k.input],
                 fn=lambda val, id: change_param('xtts_top_k', int(val), id),
                 inputs=[gr_xtts_top_k, gr_session],
-                outputs=None
+                outputs=None,
+                trigger_mode='always_last'
             )
-            gr_xtts_top_p.change(
+            gr.on(
+                triggers=[gr_xtts_top_p.release, gr_xtts_top_p.input],
                 fn=lambda val, id: change_param('xtts_top_p', float(val), id),
                 inputs=[gr_xtts_top_p, gr_session],
-                outputs=None
+                outputs=None,
+                trigger_mode='always_last'
             )
-            gr_xtts_speed.change(
+            gr.on(
+                triggers=[gr_xtts_speed.release, gr_xtts_speed.input],
                 fn=lambda val, id: change_param('xtts_speed', float(val), id),
                 inputs=[gr_xtts_speed, gr_session],
-                outputs=None
+                outputs=None,
+                trigger_mode='always_last'
             )
             gr_xtts_enable_text_splitting.select(
                 fn=lambda val, id: change_param('xtts_enable_text_splitting', bool(val), id),
@@ -2997,15 +3133,19 @@ def build_interface(args:dict)->gr.Blocks:
                 outputs=None,
                 js='()=>{if(!window._bark_sliders_initialized){const checkBarkExist=setInterval(()=>{const slider=document.querySelector("#gr_bark_waveform_temp input[type=range]");if(slider){clearInterval(checkBarkExist);window._bark_sliders_initialized=true;init_bark_sliders();}},500);}}'
             )
-            gr_bark_text_temp.change(
+            gr.on(
+                triggers=[gr_bark_text_temp.release, gr_bark_text_temp.input],
                 fn=lambda val, id: change_param('bark_text_temp', float(val), id),
                 inputs=[gr_bark_text_temp, gr_session],
-                outputs=None
+                outputs=None,
+                trigger_mode='always_last'
             )
-            gr_bark_waveform_temp.change(
+            gr.on(
+                triggers=[gr_bark_waveform_temp.release, gr_bark_waveform_temp.input],
                 fn=lambda val, id: change_param('bark_waveform_temp', float(val), id),
                 inputs=[gr_bark_waveform_temp, gr_session],
-                outputs=None
+                outputs=None,
+                trigger_mode='always_last'
             )
 
             ########### SUPERTONIC Params
@@ -3015,15 +3155,19 @@ def build_interface(args:dict)->gr.Blocks:
                 outputs=None,
                 js='()=>{if(!window._supertonic_sliders_initialized){const checkSupertonicExist=setInterval(()=>{const slider=document.querySelector("#gr_supertonic_speed input[type=range]");if(slider){clearInterval(checkSupertonicExist);window._supertonic_sliders_initialized=true;init_supertonic_sliders();}},500);}}'
             )
-            gr_supertonic_speed.change(
+            gr.on(
+                triggers=[gr_supertonic_speed.release, gr_supertonic_speed.input],
                 fn=lambda val, id: change_param('supertonic_speed', float(val), id),
                 inputs=[gr_supertonic_speed, gr_session],
-                outputs=None
+                outputs=None,
+                trigger_mode='always_last'
             )
-            gr_supertonic_total_step.change(
+            gr.on(
+                triggers=[gr_supertonic_total_step.release, gr_supertonic_total_step.input],
                 fn=lambda val, id: change_param('supertonic_total_step', int(val), id),
                 inputs=[gr_supertonic_total_step, gr_session],
-                outputs=None
+                outputs=None,
+                trigger_mode='always_last'
             )
             ############ Timer to save session to localStorage
             gr_timer = gr.Timer(9, active=False)
@@ -137,6 +137,8 @@ default_engine_settings = {
         "max_chars": 250,
         "files": ['config.json', 'model_file.pth', 'language_ids.json'],
         "voices": {},
+        "torch_compile": False,
+        "bf16_autocast": False,
         "rating": {"VRAM": 2, "CPU": 4, "RAM": 4, "Realism": 4}
     },
     TTS_ENGINES['FAIRSEQ']: {
@@ -165,6 +167,7 @@ default_engine_settings = {
         "max_chars": 300,
         "total_step": 5,
         "speed": 0.3,
+        "quant": None,
         "files": ['tts.json', 'unicode_indexer.json', 'duration_predictor.onnx', 'text_encoder.onnx', 'vector_estimator.onnx', 'vocoder.onnx'],
         "voices": {
             "M1": "Male 1 - Neutral",